@@ -1,9 +1,6 @@
 from dotenv import load_dotenv
-import os
 import streamlit as st
-from parsers.gpt_parser import GPTParser
-from parsers.regex_parser import RegexParser
-from parsers.ollama_parser import OllamaParser
+from parsers.base_parser import registry
 from datetime import datetime
 
 load_dotenv()
@@ -11,34 +8,30 @@ load_dotenv()
 def initialize_session_state():
     if 'results' not in st.session_state:
         st.session_state.results = {
-            'regex': {'result': None, 'time': None},
-            'gpt': {'result': None, 'time': None},
-            'ollama': {'result': None, 'time': None}
+            name: {'result': None, 'time': None} for name in registry.names()
         }
 
 def display_results():
-    col1, col2, col3 = st.columns(3)
+    columns = st.columns(len(registry.names()))
     
-    # Regex Results
-    with col1:
-        if st.session_state.results['regex']['result'] is not None:
-            st.subheader("Regex Parser")
-            st.json(st.session_state.results['regex']['result'])
-            st.metric("Processing Time", f"{st.session_state.results['regex']['time']:.3f}s")
-    
-    # GPT Results        
-    with col2:
-        if st.session_state.results['gpt']['result'] is not None:
-            st.subheader("GPT Parser")
-            st.json(st.session_state.results['gpt']['result'])
-            st.metric("Processing Time", f"{st.session_state.results['gpt']['time']:.3f}s")
-    
-    # Ollama Results
-    with col3:
-        if st.session_state.results['ollama']['result'] is not None:
-            st.subheader("Ollama Parser")
-            st.json(st.session_state.results['ollama']['result'])
-            st.metric("Processing Time", f"{st.session_state.results['ollama']['time']:.3f}s")
+    for col, name in zip(columns, registry.names()):
+        with col:
+            if st.session_state.results[name]['result'] is not None:
+                st.subheader(f"{registry.label(name)} Parser")
+                st.json(st.session_state.results[name]['result'])
+                st.metric("Processing Time", f"{st.session_state.results[name]['time']:.3f}s")
+
+def display_backend_stats():
+    """Show import/setup cost of the parser backends loaded so far"""
+    load_stats = registry.get_load_stats()
+    with st.expander("Parser backend load cost"):
+        if not load_stats:
+            st.write("No parser backends loaded yet")
+        for name, stats in load_stats.items():
+            st.write(
+                f"{registry.label(name)}: import {stats.get('import_ms', 0):.0f} ms, "
+                f"setup {stats.get('setup_ms', 0):.0f} ms"
+            )
 
 def show_parser_comparison():
     initialize_session_state()
@@ -58,44 +51,22 @@ def show_parser_comparison():
     else:
         alert_text = st.text_area("Enter alert text", height=150)
 
-    # Buttons for each parser
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("Run Regex Parser"):
-            regex_parser = RegexParser()
-            with st.spinner("Parsing with Regex..."):
-                start_time = datetime.now()
-                result = regex_parser.parse(alert_text)
-                process_time = (datetime.now() - start_time).total_seconds()
-                st.session_state.results['regex'] = {
-                    'result': result,
-                    'time': process_time
-                }
-    
-    with col2:
-        if st.button("Run GPT Parser"):
-            gpt_parser = GPTParser()
-            with st.spinner("Parsing with GPT..."):
-                start_time = datetime.now()
-                result = gpt_parser.parse(alert_text)
-                process_time = (datetime.now() - start_time).total_seconds()
-                st.session_state.results['gpt'] = {
-                    'result': result,
-                    'time': process_time
-                }
+    # Buttons for each parser; backends are only imported when first run
+    columns = st.columns(len(registry.names()))
     
-    with col3:
-        if st.button("Run Ollama Parser"):
-            ollama_parser = OllamaParser()
-            with st.spinner("Parsing with Ollama..."):
-                start_time = datetime.now()
-                result = ollama_parser.parse(alert_text)
-                process_time = (datetime.now() - start_time).total_seconds()
-                st.session_state.results['ollama'] = {
-                    'result': result,
-                    'time': process_time
-                }
+    for col, name in zip(columns, registry.names()):
+        label = registry.label(name)
+        with col:
+            if st.button(f"Run {label} Parser"):
+                with st.spinner(f"Parsing with {label}..."):
+                    parser = registry.get(name)
+                    start_time = datetime.now()
+                    result = parser.parse(alert_text)
+                    process_time = (datetime.now() - start_time).total_seconds()
+                    st.session_state.results[name] = {
+                        'result': result,
+                        'time': process_time
+                    }
     
     # Display all results
     st.markdown("---")
@@ -111,6 +82,7 @@ def main():
             "Select Page",
             ["Parser Comparison", "PS Data Viewer"]
         )
+        display_backend_stats()
     
     if page == "Parser Comparison":
         st.title("PS Parser Comparison")
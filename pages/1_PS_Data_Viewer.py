@@ -1,9 +1,13 @@
 import streamlit as st
 from utils.ps_processor import PSProcessor
 from utils.data_fetcher import PSDataFetcher
-from datetime import datetime, timedelta
+from utils.metrics import metrics
+from utils.ps_batch import get_upcoming_windows, load_precomputed_summary
+from utils.alert_monitor import AlertMonitor
+from parsers.base_parser import registry
+from datetime import datetime
 import pandas as pd
-import io
+import json
 
 st.title("PS Data Viewer")
 
@@ -17,7 +21,7 @@ with st.sidebar:
     
     view_mode = st.radio(
         "Select View Mode",
-        ["Single Line Analysis", "All Lines Summary"]
+        ["Single Line Analysis", "All Lines Summary", "Change Monitor"]
     )
     
     date_mode = st.radio(
@@ -26,18 +30,13 @@ with st.sidebar:
     )
     
     if date_mode == "Weekend/Weekday":
-        today = datetime.now()
-        days_to_weekend = (5 - today.weekday()) % 7
-        next_weekend = today + timedelta(days=days_to_weekend)
-        next_weekday = today + timedelta(days=(7 - today.weekday()) % 7 + 1)
+        windows = get_upcoming_windows(datetime.now())
         
         is_weekend = st.checkbox("Weekend", True)
         if is_weekend:
-            start_date = next_weekend
-            end_date = next_weekend + timedelta(days=1)
+            start_date, end_date = windows['weekend']
         else:
-            start_date = next_weekday
-            end_date = next_weekday
+            start_date, end_date = windows['weekday']
     else:
         col1, col2 = st.columns(2)
         with col1:
@@ -45,17 +44,116 @@ with st.sidebar:
         with col2:
             end_date = st.date_input("End Date")
     
+    if view_mode == "All Lines Summary":
+        use_precomputed = st.checkbox(
+            "Use precomputed summary when available", True,
+            help="Generated by `python -m utils.ps_batch`"
+        )
+    
     if view_mode == "Single Line Analysis":
         selected_route = st.selectbox(
             "Select Subway Line",
             fetcher.subway_lines
         )
+    
+    if view_mode == "Change Monitor":
+        parser_choice = st.selectbox(
+            "Parse changed alerts with",
+            ["None"] + registry.names(),
+            format_func=lambda name: name if name == "None" else registry.label(name)
+        )
+        poll_interval = st.number_input("Poll interval (seconds)", min_value=30, value=300, step=30)
+        auto_poll = st.checkbox("Auto poll", False)
 
 # Convert dates to datetime
 start_datetime = datetime.combine(start_date, datetime.min.time())
 end_datetime = datetime.combine(end_date, datetime.max.time())
 
-if st.button("Fetch PS Data"):
+def show_change_monitor():
+    """Poll the feed and show only new, changed and removed alerts"""
+    monitor_key = (start_datetime, end_datetime, parser_choice)
+    if st.session_state.get('monitor_key') != monitor_key:
+        st.session_state.monitor = AlertMonitor(
+            start_datetime, end_datetime, fetcher, processor,
+            parser=None if parser_choice == "None" else registry.get(parser_choice)
+        )
+        st.session_state.monitor_key = monitor_key
+        st.session_state.monitor_events = []
+    
+    monitor = st.session_state.monitor
+    
+    # Only this part reruns on the timer; widget changes rerun the whole page,
+    # so polls are still throttled to once per interval
+    @st.fragment(run_every=poll_interval if auto_poll else None)
+    def monitor_view():
+        poll_now = st.button("Poll Now")
+        poll_due = auto_poll and monitor.seconds_until_next_poll(poll_interval) == 0
+        if poll_now or poll_due:
+            with st.spinner("Polling alerts feed..."):
+                events = monitor.poll()
+            # Newest first, keep the log bounded
+            st.session_state.monitor_events = (events + st.session_state.monitor_events)[:1000]
+            if monitor.poll_count > 1:
+                st.success(f"{len(events)} change(s) since last poll")
+        
+        if monitor.failed_routes:
+            st.warning(
+                f"Could not fetch lines {', '.join(sorted(monitor.failed_routes))} on the last poll; "
+                "removed alerts are not reported until all lines fetch again"
+            )
+        if monitor.failed_alerts:
+            st.warning(
+                f"Could not process {len(monitor.failed_alerts)} alert(s) on the last poll; "
+                "they will be retried on the next poll"
+            )
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Active Alerts", len(monitor.results))
+        col2.metric("Polls", monitor.poll_count)
+        col3.metric("Last Polled", monitor.last_polled_at.strftime("%H:%M:%S") if monitor.last_polled_at else "-")
+        
+        tab1, tab2, tab3 = st.tabs(["Change Events", "Current Alerts", "Affected Segments"])
+        
+        with tab1:
+            if st.session_state.monitor_events:
+                events_df = pd.DataFrame(st.session_state.monitor_events)
+                if 'Parsed' in events_df.columns:
+                    events_df['Parsed'] = events_df['Parsed'].apply(json.dumps)
+                st.dataframe(events_df)
+            else:
+                st.info("No changes detected yet")
+        
+        with tab2:
+            if monitor.results:
+                current_df = pd.DataFrame(monitor.results.values())
+                if 'Parsed' in current_df.columns:
+                    current_df['Parsed'] = current_df['Parsed'].apply(json.dumps)
+                st.dataframe(current_df)
+            else:
+                st.info("No active alerts")
+        
+        with tab3:
+            geometry = st.session_state.get('segment_geometry')
+            if geometry is None:
+                st.info("Build the Disruption Map on the GTFS Data Precheck page to load segment geometry")
+            elif monitor.parser is None:
+                st.info("Select a parser to map alerts onto route segments")
+            else:
+                # numpy/plotly are only needed here, so keep them off the page's import path
+                from utils.visualization import segments_from_parse_result, create_disruption_map
+        
+                affected = []
+                for alert in monitor.alerts.values():
+                    if alert.parse_result is not None:
+                        affected.extend(segments_from_parse_result(geometry, alert.parse_result))
+                st.write(f"{len(affected)} affected segments")
+                st.plotly_chart(create_disruption_map(geometry, affected), use_container_width=True)
+        
+    monitor_view()
+
+if view_mode == "Change Monitor":
+    show_change_monitor()
+elif st.button("Fetch PS Data"):
     if view_mode == "Single Line Analysis":
         with st.spinner(f"Fetching data for line {selected_route}..."):
             data = fetcher.fetch_alerts(selected_route, start_datetime, end_datetime)
@@ -78,14 +176,23 @@ if st.button("Fetch PS Data"):
                         st.info("No relevant alerts after filtering")
     
     else:  # All Lines Summary
+        precomputed = None
+        if use_precomputed:
+            precomputed = load_precomputed_summary(start_datetime.date(), end_datetime.date())
+        
         with st.spinner("Fetching data for all lines..."):
-            all_data = {"entity": []}
-            for route in fetcher.subway_lines:
-                route_data = fetcher.fetch_alerts(route, start_datetime, end_datetime)
-                if 'entity' in route_data:
-                    all_data["entity"].extend(route_data["entity"])
-            
-            categorized_dfs = processor.process_alerts_to_summary(all_data)
+            if precomputed:
+                categorized_dfs = precomputed['categorized_dfs']
+                st.caption(f"Using precomputed summary generated at {precomputed['manifest']['generated_at']}")
+            else:
+                all_data = fetcher.fetch_all_lines(start_datetime, end_datetime)
+                if all_data['failed_routes']:
+                    st.warning(
+                        f"Could not fetch lines {', '.join(sorted(all_data['failed_routes']))}; "
+                        "the summary below is incomplete"
+                    )
+                categorized_dfs = processor.process_alerts_to_summary(all_data)
+                metrics.snapshot_memory("PS Data Viewer: all lines summary")
             
             if categorized_dfs:
                 st.success("Found alerts for selected period")
@@ -98,7 +205,10 @@ if st.button("Fetch PS Data"):
                         st.dataframe(df)
                 
                 # Export to Excel
-                excel_data = processor.create_excel_summary(categorized_dfs)
+                if precomputed and precomputed['excel_data']:
+                    excel_data = precomputed['excel_data']
+                else:
+                    excel_data = processor.create_excel_summary(categorized_dfs)
                 if excel_data:
                     st.download_button(
                         label="📥 Download Excel Summary",
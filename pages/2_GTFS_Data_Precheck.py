@@ -3,7 +3,10 @@ import streamlit as st
 import pandas as pd
 import zipfile
 import io
+from utils.metrics import metrics, timed
+from utils.gtfs_comparator import GTFSComparator
 
+@timed("load_gtfs_zip")
 def load_gtfs_zip(uploaded_zip):
     """Load GTFS files from zip into a dictionary of DataFrames"""
     gtfs_data = {}
@@ -81,6 +84,7 @@ if regular_zip and supplemented_zip:
         with st.spinner("Loading GTFS files..."):
             regular_gtfs = load_gtfs_zip(regular_zip)
             supplemented_gtfs = load_gtfs_zip(supplemented_zip)
+            metrics.snapshot_memory("GTFS Precheck: feeds loaded")
         
         if regular_gtfs and supplemented_gtfs:
             st.success("GTFS files loaded successfully!")
@@ -111,6 +115,34 @@ if regular_zip and supplemented_zip:
                     with col2:
                         st.metric("Routes only in Regular", len(reg_routes - supp_routes))
                         st.metric("Routes only in Supplemented", len(supp_routes - reg_routes))
+            
+            # Map of segments affected by supplemented service
+            st.markdown("---")
+            st.subheader("Disruption Map")
+            if st.button("Show Disruption Map"):
+                from utils.visualization import (
+                    get_segment_geometry, get_stop_patterns, segments_from_comparison, create_disruption_map
+                )
+                
+                with st.spinner("Building disruption map..."):
+                    geometry = get_segment_geometry(regular_gtfs)
+                    st.session_state.segment_geometry = geometry
+                    
+                    regular_patterns = get_stop_patterns(regular_gtfs)
+                    supplemented_patterns = get_stop_patterns(supplemented_gtfs)
+                    
+                    comparator = GTFSComparator()
+                    affected = []
+                    for route_id, route_patterns in supplemented_patterns.items():
+                        if route_id not in regular_patterns:
+                            continue
+                        differences = comparator.compare_route_patterns(
+                            regular_patterns[route_id], route_patterns
+                        )
+                        affected.extend(segments_from_comparison(geometry, str(route_id), differences))
+                    
+                    st.write(f"{len(affected)} affected segments")
+                    st.plotly_chart(create_disruption_map(geometry, affected), use_container_width=True)
 
     except Exception as e:
         st.error(f"Error processing GTFS files: {str(e)}")
\ No newline at end of file
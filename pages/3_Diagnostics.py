@@ -0,0 +1,115 @@
+# pages/3_Diagnostics.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import tracemalloc
+from utils.metrics import metrics
+from parsers.base_parser import registry
+
+st.title("Diagnostics")
+
+with st.sidebar:
+    st.header("Controls")
+
+    memory_tracing = st.checkbox(
+        "Trace memory (slows processing)",
+        value=tracemalloc.is_tracing()
+    )
+    if memory_tracing:
+        metrics.start_memory_tracing()
+    else:
+        metrics.stop_memory_tracing()
+
+    if st.button("Take Memory Snapshot"):
+        if metrics.snapshot_memory("Manual snapshot") is None:
+            st.warning("Enable memory tracing first")
+
+    if st.button("Reset Metrics"):
+        metrics.reset()
+
+    slowest_limit = st.slider("Slowest operations to show", 5, 100, 20)
+
+# Counters
+st.subheader("Counters")
+counters = metrics.get_counters()
+if counters:
+    cols = st.columns(min(len(counters), 4))
+    for idx, (name, value) in enumerate(sorted(counters.items())):
+        cols[idx % len(cols)].metric(name, f"{value:,}")
+else:
+    st.info("No counters recorded yet")
+
+# Parser backends
+st.markdown("---")
+st.subheader("Parser Backends")
+backends_df = pd.DataFrame([
+    {
+        'backend': registry.label(name),
+        'loaded': registry.is_loaded(name),
+        **registry.get_load_stats().get(name, {})
+    }
+    for name in registry.names()
+])
+st.dataframe(backends_df.round(2), use_container_width=True)
+
+# Per-stage latency
+st.markdown("---")
+st.subheader("Stage Latency")
+spans = metrics.get_spans()
+
+if spans:
+    spans_df = pd.DataFrame(spans)
+
+    summary_df = spans_df.groupby('name')['duration_ms'].agg(
+        calls='count',
+        mean_ms='mean',
+        p50_ms='median',
+        p95_ms=lambda d: d.quantile(0.95),
+        max_ms='max',
+        total_ms='sum'
+    ).sort_values('total_ms', ascending=False).reset_index()
+    st.dataframe(summary_df.round(2), use_container_width=True)
+
+    stages = summary_df['name'].tolist()
+    selected_stages = st.multiselect("Stages", stages, default=stages[:5])
+    if selected_stages:
+        fig = px.histogram(
+            spans_df[spans_df['name'].isin(selected_stages)],
+            x='duration_ms',
+            color='name',
+            barmode='overlay',
+            nbins=50,
+            labels={'duration_ms': 'Duration (ms)', 'name': 'Stage'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Slowest recent operations
+    st.markdown("---")
+    st.subheader("Slowest Recent Operations")
+    slowest_df = pd.DataFrame(metrics.slowest_spans(slowest_limit))
+    slowest_df['attributes'] = slowest_df['attributes'].astype(str)
+    st.dataframe(
+        slowest_df[['name', 'parent', 'started_at', 'duration_ms', 'error', 'attributes']].round(2),
+        use_container_width=True
+    )
+else:
+    st.info("No operations recorded yet. Use the other pages, then come back here.")
+
+# Memory
+st.markdown("---")
+st.subheader("Memory Snapshots")
+snapshots = metrics.get_memory_snapshots()
+if snapshots:
+    snapshots_df = pd.DataFrame(snapshots)
+    fig = px.line(
+        snapshots_df,
+        x='taken_at',
+        y=['current_mb', 'peak_mb'],
+        markers=True,
+        hover_data=['label'],
+        labels={'value': 'MB', 'taken_at': 'Time'}
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(snapshots_df.round(2), use_container_width=True)
+else:
+    st.info("No memory snapshots yet. Enable memory tracing to collect them.")
@@ -1 +1,168 @@
-#not needed yet (the idea is to form a standard ouput return for any parser model)
\ No newline at end of file
+# parsers/base_parser.py
+import importlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from utils.metrics import span
+
+
+@dataclass(slots=True)
+class ServiceChange:
+    change_type: str  # suspension, reroute, alternate_service, ...
+    line: str = ""
+    detail: str = ""
+    from_stop: str = ""
+    to_stop: str = ""
+
+
+@dataclass(slots=True)
+class ParseResult:
+    """Unified parser output, whatever shape the backend returned"""
+    method: str
+    affected_lines: List[str] = field(default_factory=list)
+    service_changes: List[ServiceChange] = field(default_factory=list)
+    stops_skipped: List[str] = field(default_factory=list)
+    stops_added: List[str] = field(default_factory=list)
+    time_period: str = ""
+    error: Optional[str] = None
+
+    @classmethod
+    def from_raw(cls, raw: Dict, method: str = "") -> 'ParseResult':
+        """Build from either the `service_changes` (regex/GPT) or `parsed_alert` (Ollama) shape"""
+        result = cls(method=raw.get('method', method), error=raw.get('error'))
+
+        if 'parsed_alert' in raw:
+            parsed = raw['parsed_alert'] or {}
+            locations = parsed.get('locations') or {}
+            changes = parsed.get('changes') or {}
+            result.affected_lines = list(parsed.get('affected_lines') or [])
+            result.stops_skipped = list(locations.get('stops_skipped') or [])
+            result.stops_added = list(locations.get('stops_added') or [])
+            result.time_period = (parsed.get('time_periods') or {}).get('summary', '')
+            if changes.get('type') or changes.get('description'):
+                result.service_changes.append(ServiceChange(
+                    change_type=changes.get('type') or parsed.get('service_type', ''),
+                    detail=changes.get('description', '')
+                ))
+            return result
+
+        result.affected_lines = list(raw.get('affected_lines') or [])
+        service_changes = raw.get('service_changes')
+        if not isinstance(service_changes, dict):
+            return result
+        for change_type, changes in service_changes.items():
+            # Plural keys ("suspensions", "reroutes") describe one change each
+            change_type = change_type[:-1] if change_type.endswith('s') else change_type
+            if not isinstance(changes, list):
+                changes = [changes]
+            for change in changes:
+                result.service_changes.append(cls._service_change(change_type, change))
+        return result
+
+    @staticmethod
+    def _service_change(change_type: str, change) -> ServiceChange:
+        if isinstance(change, dict):
+            return ServiceChange(
+                change_type=change_type,
+                line=change.get('line', ''),
+                detail=change.get('detail', ''),
+                from_stop=change.get('from', ''),
+                to_stop=change.get('to', '')
+            )
+        if isinstance(change, (list, tuple)):
+            # Regex suspensions are (line, from, to) tuples
+            line, from_stop, to_stop = (list(change) + ['', '', ''])[:3]
+            return ServiceChange(change_type=change_type, line=line, from_stop=from_stop, to_stop=to_stop)
+        return ServiceChange(change_type=change_type, line=str(change))
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class BaseParser(ABC):
+    """Common interface for alert text parsers"""
+    method = ""
+
+    @abstractmethod
+    def parse(self, text: str) -> Dict:
+        """Parse alert text into the backend's raw result dict"""
+
+    def parse_result(self, text: str) -> ParseResult:
+        """Parse and normalize the backend output into a ParseResult"""
+        return ParseResult.from_raw(self.parse(text), self.method)
+
+
+class ParserRegistry:
+    """Parser backends by name, imported and instantiated on first use.
+
+    Backends like GPT and Ollama pull in heavy client libraries, so nothing
+    is imported until a parser is actually requested. Instances are cached
+    (modules survive Streamlit reruns, so this is once per process) and the
+    import/setup cost of each backend is kept in `load_stats`.
+    """
+
+    def __init__(self):
+        self._backends: Dict[str, Dict] = {}
+        self._classes: Dict[str, type] = {}
+        self._instances: Dict[str, BaseParser] = {}
+        self._lock = threading.Lock()
+        self.load_stats: Dict[str, Dict] = {}
+
+    def register(self, name: str, module_path: str, class_name: str, label: str):
+        self._backends[name] = {
+            'module': module_path,
+            'class': class_name,
+            'label': label
+        }
+
+    def names(self) -> List[str]:
+        return list(self._backends)
+
+    def label(self, name: str) -> str:
+        return self._backends[name]['label']
+
+    def get_class(self, name: str) -> type:
+        """Import the backend's module on first use and return its parser class"""
+        if name not in self._backends:
+            raise KeyError(f"Unknown parser backend: {name}")
+
+        with self._lock:
+            if name not in self._classes:
+                backend = self._backends[name]
+                with span("ParserRegistry.import", backend=name):
+                    start = time.perf_counter()
+                    module = importlib.import_module(backend['module'])
+                    import_ms = (time.perf_counter() - start) * 1000
+                self._classes[name] = getattr(module, backend['class'])
+                self.load_stats.setdefault(name, {})['import_ms'] = import_ms
+            return self._classes[name]
+
+    def get(self, name: str) -> BaseParser:
+        """Return the shared parser instance, creating it on first use"""
+        parser_class = self.get_class(name)
+
+        with self._lock:
+            if name not in self._instances:
+                with span("ParserRegistry.setup", backend=name):
+                    start = time.perf_counter()
+                    self._instances[name] = parser_class()
+                    setup_ms = (time.perf_counter() - start) * 1000
+                self.load_stats[name]['setup_ms'] = setup_ms
+            return self._instances[name]
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def get_load_stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.load_stats.items()}
+
+
+registry = ParserRegistry()
+registry.register('regex', 'parsers.regex_parser', 'RegexParser', 'Regex')
+registry.register('gpt', 'parsers.gpt_parser', 'GPTParser', 'GPT')
+registry.register('ollama', 'parsers.ollama_parser', 'OllamaParser', 'Ollama')
+
@@ -5,8 +5,12 @@ from openai import OpenAI
 import json
 import os
 from dotenv import load_dotenv
+from utils.metrics import timed, increment
+from parsers.base_parser import BaseParser
 
-class GPTParser:
+class GPTParser(BaseParser):
+    method = "gpt4"
+    
     def __init__(self):
         load_dotenv()
         try:
@@ -19,6 +23,7 @@ class GPTParser:
             raise ValueError("OpenAI API key not found! Please check your .env file or Streamlit secrets")
         self.client = OpenAI(api_key=api_key)
     
+    @timed()
     def parse(self, text: str) -> Dict:
         try:
             response = self.client.chat.completions.create(
@@ -47,6 +52,10 @@ class GPTParser:
                     "content": f"Parse this MTA alert:\n\n{text}"
                 }]
             )
+            increment("gpt_api_calls")
+            if response.usage is not None:
+                increment("gpt_prompt_tokens", response.usage.prompt_tokens)
+                increment("gpt_completion_tokens", response.usage.completion_tokens)
             
             result = json.loads(response.choices[0].message.content)
             result["method"] = "gpt4"
@@ -1,6 +1,7 @@
 # parsers/gtfs_parser.py
 from typing import Dict
 import pandas as pd
+from utils.metrics import timed
 
 class GTFSParser:
     def __init__(self):
@@ -22,6 +23,7 @@ class GTFSParser:
             'FS', 'GS', 'H'  # Shuttles
         ]
 
+    @timed()
     def get_route_patterns(self, gtfs_data: Dict[str, pd.DataFrame], route_id: str, include_variants: bool = True) -> Dict:
         """Extract patterns for a route and its variants"""
         # Determine which route IDs to include
@@ -56,6 +58,33 @@ class GTFSParser:
         
         return patterns
 
+    @timed()
+    def get_stop_patterns(self, gtfs_data: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+        """Distinct stop patterns per route and direction, most frequent first.
+
+        Output matches what GTFSComparator.compare_route_patterns expects:
+        {route_id: {'direction_0': [{'stop_ids': (...), 'count': n}, ...], ...}}
+        """
+        stop_times = gtfs_data['stop_times'].sort_values(['trip_id', 'stop_sequence'])
+        trip_stops = stop_times.groupby('trip_id', sort=False)['stop_id'].agg(tuple).rename('stop_ids')
+        
+        trips = gtfs_data['trips'][['trip_id', 'route_id', 'direction_id']].merge(
+            trip_stops, left_on='trip_id', right_index=True
+        )
+        pattern_counts = trips.groupby(
+            ['route_id', 'direction_id', 'stop_ids']
+        ).size().reset_index(name='count').sort_values('count', ascending=False)
+        
+        patterns = {}
+        for row in pattern_counts.itertuples(index=False):
+            route_patterns = patterns.setdefault(row.route_id, {'direction_0': [], 'direction_1': []})
+            route_patterns[f'direction_{row.direction_id}'].append({
+                'stop_ids': row.stop_ids,
+                'count': row.count
+            })
+        
+        return patterns
+
     def _get_stop_sequence(self, gtfs_data: Dict[str, pd.DataFrame], trip_id: str) -> pd.DataFrame:
         """Get the stop sequence for a specific trip"""
         stops = gtfs_data['stop_times'][
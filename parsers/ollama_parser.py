@@ -2,11 +2,16 @@
 import ollama
 from typing import Dict
 import json
+from utils.metrics import timed, increment
+from parsers.base_parser import BaseParser
 
-class OllamaParser:
+class OllamaParser(BaseParser):
+    method = "ollama_mistral"
+    
     def __init__(self):
         self.model = 'mistral'
     
+    @timed()
     def parse(self, text: str) -> Dict:
         try:
             prompt = f"""
@@ -48,6 +53,9 @@ class OllamaParser:
                 model=self.model,
                 prompt=prompt
             )
+            increment("ollama_calls")
+            increment("ollama_prompt_tokens", response.get('prompt_eval_count') or 0)
+            increment("ollama_completion_tokens", response.get('eval_count') or 0)
             
             result = json.loads(response['response'])
             return result
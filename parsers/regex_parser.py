@@ -1,8 +1,13 @@
 # parsers/regex_parser.py
 import re
 from typing import Dict
+from utils.metrics import timed
+from parsers.base_parser import BaseParser
 
-class RegexParser:
+class RegexParser(BaseParser):
+    method = "regex"
+
+    @timed()
     def parse(self, text: str) -> Dict:
         # Extract lines mentioned in brackets
         lines = re.findall(r'\[([A-Z])\]', text)
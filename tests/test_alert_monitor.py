@@ -0,0 +1,203 @@
+from datetime import datetime, timedelta
+
+from parsers.regex_parser import RegexParser
+from utils.alert_monitor import AlertMonitor
+from utils.metrics import metrics
+from utils.ps_processor import PSProcessor
+
+
+def make_entity(alert_id, header, route_id='F', alert_type=''):
+    return {
+        'id': alert_id,
+        'alert': {
+            'header_text': {'translation': [{'text': header}]},
+            'informed_entity': [{'route_id': route_id}],
+            'transit_realtime.mercury_alert': {'alert_type': alert_type}
+        }
+    }
+
+
+class StubFetcher:
+    """Returns one queued feed per poll"""
+
+    def __init__(self, *feeds):
+        self.feeds = list(feeds)
+
+    def fetch_all_lines(self, start_date, end_date):
+        return self.feeds.pop(0)
+
+
+class CountingParser(RegexParser):
+    def __init__(self):
+        self.calls = 0
+
+    def parse(self, text):
+        self.calls += 1
+        return super().parse(text)
+
+
+def feed(*entities, failed_routes=None):
+    return {'entity': list(entities), 'failed_routes': failed_routes or {}}
+
+
+def changes(events):
+    return sorted((event['Change'], event['Alert ID']) for event in events)
+
+
+def make_monitor(fetcher, parser=None):
+    return AlertMonitor(None, None, fetcher, PSProcessor(), parser=parser)
+
+
+def test_poll_reports_new_changed_and_removed():
+    monitor = make_monitor(StubFetcher(
+        feed(make_entity('1', 'Free shuttle buses'), make_entity('2', 'Trains run local')),
+        feed(make_entity('1', 'Free shuttle buses'), make_entity('2', 'Trains are rerouted')),
+        feed(make_entity('2', 'Trains are rerouted'))
+    ))
+
+    assert changes(monitor.poll()) == [('new', '1'), ('new', '2')]
+    assert monitor.results['2']['Category'] == 'Run Local'
+
+    assert changes(monitor.poll()) == [('changed', '2')]
+    assert monitor.results['2']['Category'] == 'Reroute'
+
+    assert changes(monitor.poll()) == [('removed', '1')]
+    assert list(monitor.results) == ['2']
+    assert list(monitor.alerts) == ['2']
+
+
+def test_duplicate_entities_are_processed_once():
+    parser = CountingParser()
+    monitor = make_monitor(StubFetcher(
+        feed(make_entity('1', 'No F service', 'F'), make_entity('1', 'No F service', 'F'))
+    ), parser)
+
+    assert changes(monitor.poll()) == [('new', '1')]
+    assert parser.calls == 1
+
+
+def test_unchanged_alerts_are_not_reparsed():
+    parser = CountingParser()
+    entity = make_entity('1', 'Free shuttle buses')
+    monitor = make_monitor(StubFetcher(feed(entity), feed(entity)), parser)
+
+    monitor.poll()
+    assert monitor.poll() == []
+    assert parser.calls == 1
+    assert monitor.results['1']['Parsed']['method'] == 'regex'
+
+
+def test_filtered_alert_is_reported_as_removed():
+    monitor = make_monitor(StubFetcher(
+        feed(make_entity('1', 'Free shuttle buses')),
+        feed(make_entity('1', 'Free shuttle buses', alert_type='Reduced Service'))
+    ))
+
+    monitor.poll()
+    assert changes(monitor.poll()) == [('removed', '1')]
+    assert monitor.results == {}
+
+
+def test_failed_fetch_does_not_report_removals_or_reparse():
+    parser = CountingParser()
+    shuttle = make_entity('1', 'Free shuttle buses', 'A')
+    reroute = make_entity('2', 'Trains are rerouted', 'F')
+    monitor = make_monitor(StubFetcher(
+        feed(shuttle, reroute),
+        feed(reroute, failed_routes={'A': 'timeout'}),
+        feed(failed_routes={route: 'timeout' for route in ('A', 'F')}),
+        feed(shuttle, reroute)
+    ), parser)
+
+    monitor.poll()
+    assert monitor.poll() == []
+    assert monitor.failed_routes == {'A': 'timeout'}
+    assert monitor.poll() == []
+    assert set(monitor.results) == {'1', '2'}
+
+    # Back to normal: nothing changed, so nothing is reported or parsed again
+    assert monitor.poll() == []
+    assert monitor.failed_routes == {}
+    assert parser.calls == 2
+
+
+def test_seconds_until_next_poll():
+    monitor = make_monitor(StubFetcher())
+    assert monitor.seconds_until_next_poll(300) == 0
+
+    monitor.last_polled_at = datetime.now() - timedelta(seconds=100)
+    assert 199 <= monitor.seconds_until_next_poll(300) <= 200
+
+    monitor.last_polled_at = datetime.now() - timedelta(seconds=400)
+    assert monitor.seconds_until_next_poll(300) == 0
+
+
+class FlakyParser(RegexParser):
+    """Fails on texts containing `fail_on`, `failures` times each"""
+
+    def __init__(self, fail_on, failures=1):
+        self.fail_on = fail_on
+        self.failures = failures
+
+    def parse(self, text):
+        if self.fail_on in text and self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("backend unavailable")
+        return super().parse(text)
+
+
+def test_failed_processing_is_retried_on_next_poll():
+    entity = make_entity('1', 'Free shuttle buses')
+    monitor = make_monitor(StubFetcher(feed(entity), feed(entity)), FlakyParser('shuttle'))
+
+    assert monitor.poll() == []
+    assert monitor.failed_alerts == {'1': 'backend unavailable'}
+    assert monitor.results == {}
+
+    assert changes(monitor.poll()) == [('new', '1')]
+    assert monitor.failed_alerts == {}
+    assert monitor.results['1']['Parsed']['method'] == 'regex'
+
+
+def test_failed_change_keeps_previous_result_until_retried():
+    monitor = make_monitor(StubFetcher(
+        feed(make_entity('1', 'Trains run local')),
+        feed(make_entity('1', 'Trains are rerouted')),
+        feed(make_entity('1', 'Trains are rerouted'))
+    ), FlakyParser('rerouted'))
+
+    monitor.poll()
+    assert monitor.poll() == []
+    assert monitor.results['1']['Category'] == 'Run Local'
+
+    assert changes(monitor.poll()) == [('changed', '1')]
+    assert monitor.results['1']['Category'] == 'Reroute'
+
+
+def test_one_bad_entity_does_not_drop_other_events():
+    monitor = make_monitor(StubFetcher(
+        feed(make_entity('1', 'Free shuttle buses'), make_entity('2', 'Trains run local'),
+             make_entity('3', 'Trains are rerouted'))
+    ), FlakyParser('local'))
+
+    assert changes(monitor.poll()) == [('new', '1'), ('new', '3')]
+    assert set(monitor.failed_alerts) == {'2'}
+
+
+def test_unchanged_counter_counts_matching_hashes():
+    entity = make_entity('1', 'Free shuttle buses')
+    monitor = make_monitor(StubFetcher(
+        feed(entity, make_entity('2', 'Trains run local')),
+        # One unchanged alert and one removal: the old formula gave 1 - 1 = 0
+        feed(entity),
+        # Only removals would have counted -1
+        feed()
+    ))
+    before = metrics.get_counters().get('monitor_unchanged', 0)
+
+    monitor.poll()
+    assert metrics.get_counters().get('monitor_unchanged', 0) == before
+    monitor.poll()
+    assert metrics.get_counters()['monitor_unchanged'] == before + 1
+    monitor.poll()
+    assert metrics.get_counters()['monitor_unchanged'] == before + 1
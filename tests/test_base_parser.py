@@ -0,0 +1,65 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from parsers.base_parser import BaseParser, ParserRegistry
+from parsers.regex_parser import RegexParser
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_registry():
+    registry = ParserRegistry()
+    registry.register('regex', 'parsers.regex_parser', 'RegexParser', 'Regex')
+    return registry
+
+
+def test_importing_app_does_not_load_parser_backends():
+    code = (
+        "import sys\n"
+        "import parsers.base_parser, app\n"
+        "print(sorted(m for m in ('parsers.gpt_parser', 'parsers.ollama_parser', 'openai', 'ollama')"
+        " if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=REPO_ROOT, check=True).stdout
+
+    assert output.strip() == '[]'
+
+
+def test_get_returns_cached_instance():
+    registry = make_registry()
+    assert not registry.is_loaded('regex')
+
+    parser = registry.get('regex')
+
+    assert isinstance(parser, RegexParser)
+    assert registry.get('regex') is parser
+    assert registry.is_loaded('regex')
+
+
+def test_load_stats_record_import_and_setup():
+    registry = make_registry()
+
+    registry.get_class('regex')
+    assert set(registry.get_load_stats()['regex']) == {'import_ms'}
+
+    registry.get('regex')
+    stats = registry.get_load_stats()['regex']
+    assert set(stats) == {'import_ms', 'setup_ms'}
+    assert stats['import_ms'] >= 0 and stats['setup_ms'] >= 0
+
+
+def test_unknown_backend_raises_key_error():
+    registry = make_registry()
+
+    with pytest.raises(KeyError):
+        registry.get('missing')
+    assert registry.get_load_stats() == {}
+
+
+def test_base_parser_requires_parse():
+    with pytest.raises(TypeError):
+        BaseParser()
@@ -0,0 +1,98 @@
+import tracemalloc
+
+import pytest
+
+from utils.metrics import MetricsRegistry
+
+
+def test_span_records_parent_and_attributes():
+    metrics = MetricsRegistry()
+
+    with metrics.span("outer", route_id='F') as attrs:
+        with metrics.span("inner"):
+            pass
+        attrs['rows'] = 3
+
+    inner, outer = metrics.get_spans()
+    assert inner['name'] == 'inner'
+    assert inner['parent'] == 'outer'
+    assert outer['parent'] is None
+    assert outer['attributes'] == {'route_id': 'F', 'rows': 3}
+    assert outer['error'] is None
+    assert outer['duration_ms'] >= inner['duration_ms'] >= 0
+
+
+def test_span_records_error_and_reraises():
+    metrics = MetricsRegistry()
+
+    with pytest.raises(ValueError):
+        with metrics.span("failing"):
+            raise ValueError("bad feed")
+
+    assert metrics.get_spans()[0]['error'] == 'bad feed'
+    # The stack is unwound, so the next span has no parent
+    with metrics.span("after"):
+        pass
+    assert metrics.get_spans()[1]['parent'] is None
+
+
+def test_timed_uses_qualname_by_default():
+    metrics = MetricsRegistry()
+
+    @metrics.timed()
+    def load():
+        return 42
+
+    @metrics.timed("custom")
+    def other():
+        return None
+
+    assert load() == 42
+    other()
+
+    assert [s['name'] for s in metrics.get_spans()] == [load.__qualname__, 'custom']
+
+
+def test_increment_and_reset():
+    metrics = MetricsRegistry()
+
+    metrics.increment("api_calls")
+    metrics.increment("api_calls", 2)
+    metrics.increment("api_errors")
+    with metrics.span("fetch"):
+        pass
+
+    assert metrics.get_counters() == {'api_calls': 3, 'api_errors': 1}
+
+    metrics.reset()
+    assert metrics.get_counters() == {}
+    assert metrics.get_spans() == []
+    assert metrics.get_memory_snapshots() == []
+
+
+def test_slowest_spans_sorted_by_duration():
+    metrics = MetricsRegistry()
+    for name, duration in [('a', 5.0), ('b', 20.0), ('c', 1.0)]:
+        metrics.spans.append({'name': name, 'duration_ms': duration})
+
+    assert [s['name'] for s in metrics.slowest_spans()] == ['b', 'a', 'c']
+    assert [s['name'] for s in metrics.slowest_spans(limit=1)] == ['b']
+
+
+def test_snapshot_memory_only_while_tracing():
+    metrics = MetricsRegistry()
+    was_tracing = tracemalloc.is_tracing()
+    metrics.stop_memory_tracing()
+
+    assert metrics.snapshot_memory("idle") is None
+
+    metrics.start_memory_tracing()
+    try:
+        snapshot = metrics.snapshot_memory("traced")
+    finally:
+        if not was_tracing:
+            metrics.stop_memory_tracing()
+
+    assert snapshot['label'] == 'traced'
+    assert snapshot['peak_mb'] >= snapshot['current_mb'] >= 0
+    assert metrics.get_memory_snapshots() == [snapshot]
@@ -0,0 +1,110 @@
+from parsers.base_parser import ParseResult, ServiceChange
+from parsers.regex_parser import RegexParser
+
+
+def test_from_raw_regex_shape():
+    raw = RegexParser().parse(
+        "[F] trains rerouted\nNo F service between 57 St and York St\n"
+    )
+    result = ParseResult.from_raw(raw)
+
+    assert result.method == 'regex'
+    assert result.affected_lines == ['F']
+    assert result.service_changes == [
+        ServiceChange(change_type='suspension', line='F', from_stop='57 St', to_stop='York St')
+    ]
+    assert result.error is None
+
+
+def test_from_raw_regex_reroute_strings():
+    raw = {
+        'affected_lines': ['F'],
+        'service_changes': {'suspensions': [], 'reroutes': ['F']},
+        'method': 'regex'
+    }
+    result = ParseResult.from_raw(raw)
+
+    assert result.service_changes == [ServiceChange(change_type='reroute', line='F')]
+
+
+def test_from_raw_gpt_shape():
+    raw = {
+        'affected_lines': ['F', 'D'],
+        'service_changes': {
+            'suspensions': [{'line': 'F', 'from': '57 St', 'to': 'York St'}],
+            'reroutes': [{'line': 'F', 'detail': 'via the Q'}],
+            'alternate_service': [{'line': 'D', 'detail': 'replaces F in Brooklyn'}]
+        },
+        'method': 'gpt4'
+    }
+    result = ParseResult.from_raw(raw)
+
+    assert result.method == 'gpt4'
+    assert result.affected_lines == ['F', 'D']
+    assert result.service_changes == [
+        ServiceChange(change_type='suspension', line='F', from_stop='57 St', to_stop='York St'),
+        ServiceChange(change_type='reroute', line='F', detail='via the Q'),
+        ServiceChange(change_type='alternate_service', line='D', detail='replaces F in Brooklyn')
+    ]
+
+
+def test_from_raw_ollama_shape():
+    raw = {
+        'parsed_alert': {
+            'affected_lines': ['F'],
+            'service_type': 'reroute',
+            'locations': {
+                'stations': ['57 St', 'York St'],
+                'stops_added': ['Lexington Av/63 St'],
+                'stops_skipped': ['23 St', '14 St']
+            },
+            'time_periods': {'summary': 'Feb 3 - 7, 9:30 PM to 5:00 AM', 'type': 'overnight'},
+            'changes': {'type': '', 'description': 'F runs via the Q'}
+        },
+        'method': 'ollama_mistral'
+    }
+    result = ParseResult.from_raw(raw)
+
+    assert result.method == 'ollama_mistral'
+    assert result.affected_lines == ['F']
+    assert result.stops_added == ['Lexington Av/63 St']
+    assert result.stops_skipped == ['23 St', '14 St']
+    assert result.time_period == 'Feb 3 - 7, 9:30 PM to 5:00 AM'
+    # Falls back to service_type when the change type is empty
+    assert result.service_changes == [ServiceChange(change_type='reroute', detail='F runs via the Q')]
+
+
+def test_from_raw_error_results():
+    gpt_error = ParseResult.from_raw({
+        'error': 'JSON parsing error: bad',
+        'method': 'gpt4',
+        'affected_lines': [],
+        'service_changes': {}
+    })
+    assert gpt_error.error == 'JSON parsing error: bad'
+    assert gpt_error.affected_lines == []
+    assert gpt_error.service_changes == []
+
+    ollama_error = ParseResult.from_raw({'error': 'connection refused', 'method': 'ollama_mistral'})
+    assert ollama_error.method == 'ollama_mistral'
+    assert ollama_error.error == 'connection refused'
+    assert ollama_error.service_changes == []
+
+
+def test_from_raw_uses_parser_method_when_missing():
+    result = ParseResult.from_raw({'affected_lines': ['A'], 'service_changes': 'none'}, 'gpt4')
+
+    assert result.method == 'gpt4'
+    assert result.affected_lines == ['A']
+    assert result.service_changes == []
+
+
+def test_parse_result_matches_parse():
+    parser = RegexParser()
+    text = "[A] and [C] trains rerouted"
+
+    result = parser.parse_result(text)
+
+    assert result == ParseResult.from_raw(parser.parse(text))
+    assert set(result.affected_lines) == {'A', 'C'}
+    assert result.to_dict()['method'] == 'regex'
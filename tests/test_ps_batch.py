@@ -0,0 +1,148 @@
+import json
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from utils import ps_batch
+from utils.data_fetcher import PSDataFetcher
+from utils.ps_batch import (
+    ExcelExportError,
+    FetchFailedError,
+    load_precomputed_summary,
+    run,
+    write_summary
+)
+from utils.ps_processor import PSProcessor
+
+
+def make_entity(alert_id, header):
+    return {
+        'id': alert_id,
+        'alert': {
+            'header_text': {'translation': [{'text': header}]},
+            'informed_entity': [{'route_id': 'F'}]
+        }
+    }
+
+
+class StubFetcher(PSDataFetcher):
+    def __init__(self, responses):
+        super().__init__()
+        self.subway_lines = list(responses)
+        self.responses = responses
+
+    def fetch_alerts(self, route_id, start_date, end_date):
+        return self.responses[route_id]
+
+
+START = date(2025, 2, 3)
+END = date(2025, 2, 4)
+
+
+def test_fetch_all_lines_reports_failed_routes():
+    fetcher = StubFetcher({
+        'F': {'entity': [make_entity('1', 'shuttle')]},
+        'A': {'error': 'timeout'}
+    })
+    data = fetcher.fetch_all_lines(None, None)
+    assert [entity['id'] for entity in data['entity']] == ['1']
+    assert data['failed_routes'] == {'A': 'timeout'}
+
+
+def test_run_does_not_write_manifest_when_a_route_fails(tmp_path):
+    fetcher = StubFetcher({
+        'F': {'entity': [make_entity('1', 'shuttle')]},
+        'A': {'error': 'timeout'}
+    })
+    with pytest.raises(FetchFailedError) as excinfo:
+        run(START, END, str(tmp_path), ("parquet",), fetcher, PSProcessor())
+
+    assert excinfo.value.failed_routes == {'A': 'timeout'}
+    assert load_precomputed_summary(START, END, str(tmp_path)) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_run_writes_readable_summary(tmp_path):
+    fetcher = StubFetcher({'F': {'entity': [make_entity('1', 'Free shuttle buses')]}})
+    run(START, END, str(tmp_path), ("parquet",), fetcher, PSProcessor())
+
+    summary = load_precomputed_summary(START, END, str(tmp_path))
+    assert summary['manifest']['alert_count'] == 1
+    assert list(summary['categorized_dfs']) == ['Replacement Shuttles']
+    assert summary['categorized_dfs']['Replacement Shuttles']['Line'].tolist() == ['F']
+
+
+def test_write_summary_replaces_previous_output(tmp_path):
+    processor = PSProcessor()
+    first = processor.process_alerts_to_summary({'entity': [make_entity('1', 'Free shuttle buses')]})
+    second = processor.process_alerts_to_summary({'entity': [make_entity('2', 'Trains are rerouted')]})
+
+    write_summary(processor, first, START, END, 1, str(tmp_path), ("parquet",))
+    summary_dir = write_summary(processor, second, START, END, 1, str(tmp_path), ("parquet",))
+
+    assert sorted(path.name for path in summary_dir.iterdir()) == ['Reroute.parquet', 'manifest.json']
+    assert json.loads((summary_dir / 'manifest.json').read_text())['categories'] == ['Reroute']
+    # No temporary or old directories left behind
+    assert list(tmp_path.iterdir()) == [summary_dir]
+
+
+def test_load_precomputed_summary_ignores_stale_summary(tmp_path):
+    processor = PSProcessor()
+    categorized_dfs = processor.process_alerts_to_summary({'entity': [make_entity('1', 'Free shuttle buses')]})
+    summary_dir = write_summary(processor, categorized_dfs, START, END, 1, str(tmp_path), ("parquet",))
+
+    manifest_path = summary_dir / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest['generated_at'] = (datetime.now() - timedelta(hours=7)).isoformat(timespec='seconds')
+    manifest_path.write_text(json.dumps(manifest))
+
+    assert load_precomputed_summary(START, END, str(tmp_path), max_age_hours=6) is None
+    assert load_precomputed_summary(START, END, str(tmp_path), max_age_hours=8) is not None
+
+
+def test_write_summary_raises_when_excel_fails(tmp_path, monkeypatch):
+    processor = PSProcessor()
+    categorized_dfs = processor.process_alerts_to_summary({'entity': [make_entity('1', 'Free shuttle buses')]})
+    monkeypatch.setattr(processor, 'create_excel_summary', lambda dfs: None)
+
+    with pytest.raises(ExcelExportError):
+        write_summary(processor, categorized_dfs, START, END, 1, str(tmp_path), ("excel", "parquet"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_manifest_lists_only_written_formats(tmp_path):
+    processor = PSProcessor()
+    with_alerts = processor.process_alerts_to_summary({'entity': [make_entity('1', 'Free shuttle buses')]})
+
+    summary_dir = write_summary(processor, with_alerts, START, END, 1, str(tmp_path), ("excel", "parquet"))
+    assert json.loads((summary_dir / 'manifest.json').read_text())['formats'] == ['excel', 'parquet']
+    assert load_precomputed_summary(START, END, str(tmp_path))['excel_data']
+
+    # No alerts means no sheets, so there is no Excel file to record
+    summary_dir = write_summary(processor, {}, START, END, 0, str(tmp_path), ("excel", "parquet"))
+    assert json.loads((summary_dir / 'manifest.json').read_text())['formats'] == ['parquet']
+    assert sorted(path.name for path in summary_dir.iterdir()) == ['manifest.json']
+
+
+def test_main_exits_non_zero_when_excel_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(ps_batch, 'PSDataFetcher',
+                        lambda: StubFetcher({'F': {'entity': [make_entity('1', 'Free shuttle buses')]}}))
+    monkeypatch.setattr(PSProcessor, 'create_excel_summary', lambda self, dfs: None)
+
+    with pytest.raises(SystemExit) as excinfo:
+        ps_batch.main(['--start', '2025-02-03', '--output-dir', str(tmp_path)])
+
+    assert excinfo.value.code == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_batch_cli_does_not_import_streamlit():
+    code = "import sys, utils.ps_batch; print('streamlit' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=Path(__file__).resolve().parent.parent, check=True).stdout
+
+    assert output.strip() == 'False'
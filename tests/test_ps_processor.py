@@ -0,0 +1,165 @@
+from datetime import datetime
+
+import pandas as pd
+
+from utils.data_handler import Alert, normalize_alerts
+from utils.ps_processor import PSProcessor
+
+FEED = {
+    'entity': [
+        {
+            'id': 'lmm:planned_work:1',
+            'alert': {
+                'active_period': [{'start': 1738632600, 'end': 1738659600}, {'start': 1738546200}],
+                'informed_entity': [{'agency_id': 'MTASBWY', 'route_id': 'F'},
+                                    {'agency_id': 'MTASBWY', 'route_id': 'D'},
+                                    {'agency_id': 'MTASBWY', 'route_id': 'F'},
+                                    {'agency_id': 'MTASBWY', 'stop_id': 'F12'}],
+                'header_text': {'translation': [{'text': '[F] is rerouted in Manhattan', 'language': 'en'}]},
+                'description_text': {'translation': [{'text': 'Free shuttle buses run', 'language': 'en'}]},
+                'transit_realtime.mercury_alert': {
+                    'alert_type': 'Planned - Reroute',
+                    'human_readable_active_period': {'translation': [{'text': 'Feb 3 - 7, 9:30 PM to 5:00 AM'}]}
+                }
+            }
+        },
+        {
+            'id': 'lmm:planned_work:2',
+            'alert': {
+                'active_period': [{'start': 1738546200}],
+                'informed_entity': [{'route_id': 'A'}],
+                'header_text': {'translation': [{'text': 'A trains run local'}]},
+                'transit_realtime.mercury_alert': {'alert_type': 'Planned - Express to Local'}
+            }
+        },
+        {
+            'id': 'lmm:planned_work:3',
+            'alert': {
+                'informed_entity': [{'route_id': 'G'}],
+                'header_text': {'translation': [{'text': 'Fewer G trains'}]},
+                'transit_realtime.mercury_alert': {'alert_type': 'Reduced Service'}
+            }
+        },
+        {
+            'id': 'lmm:planned_work:4',
+            'alert': {
+                'header_text': {'translation': [{'text': 'Elevator work'}]}
+            }
+        },
+        {'id': 'trip_update', 'trip_update': {}}
+    ]
+}
+
+
+def legacy_summary_rows(data):
+    """Dict-walking implementation PSProcessor used before the Alert model"""
+    processor = PSProcessor()
+    rows = {}
+    for entity in data.get('entity', []):
+        if 'alert' in entity:
+            alert = entity['alert']
+            alert_type = alert.get('transit_realtime.mercury_alert', {}).get('alert_type', '')
+            if 'Reduced Service' in alert_type:
+                continue
+            header = alert.get('header_text', {}).get('translation', [{}])[0].get('text', '')
+            desc = alert.get('description_text', {}).get('translation', [{}])[0].get('text', '')
+            routes = [informed['route_id'] for informed in alert.get('informed_entity', [])
+                      if 'route_id' in informed]
+            category = processor.categorize_alert(header, desc, alert_type)
+            rows.setdefault(category, []).append({
+                'Line': ', '.join(sorted(set(routes))),
+                'Date': alert.get('transit_realtime.mercury_alert', {}).get('human_readable_active_period', {}).get('translation', [{}])[0].get('text', ''),
+                'Type': alert_type,
+                'Impact': header,
+                'Description': desc,
+                'In GTFS': '',
+                'Notes': ''
+            })
+    return rows
+
+
+def legacy_single_line_rows(data):
+    rows = []
+    for entity in data.get('entity', []):
+        if 'alert' in entity:
+            alert = entity['alert']
+            alert_type = alert.get('transit_realtime.mercury_alert', {}).get('alert_type', '')
+            if 'Reduced Service' in alert_type:
+                continue
+            start_time = min((period.get('start', float('inf'))
+                              for period in alert.get('active_period', [])), default=float('inf'))
+            rows.append({
+                'Start Time': datetime.fromtimestamp(start_time) if start_time != float('inf') else None,
+                'Type': alert_type,
+                'Header': alert.get('header_text', {}).get('translation', [{}])[0].get('text', ''),
+                'Period': alert.get('transit_realtime.mercury_alert', {}).get('human_readable_active_period', {}).get('translation', [{}])[0].get('text', '')
+            })
+    return rows
+
+
+def test_alert_from_entity():
+    alert = Alert.from_entity(FEED['entity'][0])
+
+    assert alert.alert_id == 'lmm:planned_work:1'
+    assert alert.alert_type == 'Planned - Reroute'
+    assert alert.header == '[F] is rerouted in Manhattan'
+    assert alert.description == 'Free shuttle buses run'
+    assert alert.routes == ('D', 'F')
+    assert alert.active_period == 'Feb 3 - 7, 9:30 PM to 5:00 AM'
+    assert alert.start_time == datetime.fromtimestamp(1738546200)
+    assert alert.category is None
+    assert not alert.is_reduced_service
+
+
+def test_alert_from_entity_missing_fields():
+    alert = Alert.from_entity(FEED['entity'][3])
+
+    assert alert.alert_type == ''
+    assert alert.description == ''
+    assert alert.routes == ()
+    assert alert.active_period == ''
+    assert alert.start_time is None
+
+
+def test_normalize_alerts_skips_non_alert_entities():
+    alerts = normalize_alerts(FEED)
+
+    assert [alert.alert_id for alert in alerts] == [
+        'lmm:planned_work:1', 'lmm:planned_work:2', 'lmm:planned_work:3', 'lmm:planned_work:4'
+    ]
+    assert alerts[2].is_reduced_service
+
+
+def test_process_alerts_to_summary_matches_legacy_output():
+    summary = PSProcessor().process_alerts_to_summary(FEED)
+    expected = legacy_summary_rows(FEED)
+
+    assert list(summary) == [category for category in
+                             ['Replacement Shuttles', 'Reroute', 'Run Local', 'Suspended', 'Other']
+                             if category in expected]
+    for category, rows in expected.items():
+        pd.testing.assert_frame_equal(summary[category], pd.DataFrame(rows))
+
+
+def test_process_alerts_to_summary_accepts_normalized_alerts():
+    processor = PSProcessor()
+    from_feed = processor.process_alerts_to_summary(FEED)
+    from_alerts = processor.process_alerts_to_summary(normalize_alerts(FEED))
+
+    assert list(from_feed) == list(from_alerts)
+    for category in from_feed:
+        pd.testing.assert_frame_equal(from_feed[category], from_alerts[category])
+
+
+def test_process_single_line_alerts_matches_legacy_output():
+    df = PSProcessor().process_single_line_alerts(FEED)
+    expected = pd.DataFrame(legacy_single_line_rows(FEED)).sort_values('Start Time')
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_process_alert_filters_reduced_service():
+    processor = PSProcessor()
+
+    assert processor.process_alert(Alert.from_entity(FEED['entity'][2])) is None
+    assert processor.process_alert(Alert.from_entity(FEED['entity'][1])).category == 'Run Local'
@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+
+from parsers.gtfs_parser import GTFSParser
+from utils.gtfs_comparator import GTFSComparator
+from utils.visualization import (
+    build_segment_geometry,
+    get_segment_geometry,
+    get_stop_patterns,
+    segments_from_comparison,
+    simplify_line
+)
+
+
+def make_feed(shape, stops, trips):
+    """Build a feed dict from shape points, (stop_id, lat, lon) stops and {trip_id: stop_ids}"""
+    shape = np.asarray(shape, dtype=float)
+    return {
+        'shapes': pd.DataFrame({
+            'shape_id': 'S1',
+            'shape_pt_lat': shape[:, 0],
+            'shape_pt_lon': shape[:, 1],
+            'shape_pt_sequence': range(len(shape))
+        }),
+        'stops': pd.DataFrame(stops, columns=['stop_id', 'stop_lat', 'stop_lon']).assign(
+            stop_name=lambda df: df['stop_id'] + ' St'
+        ),
+        'trips': pd.DataFrame({
+            'trip_id': list(trips),
+            'route_id': 'F',
+            'direction_id': 0,
+            'shape_id': 'S1'
+        }),
+        'stop_times': pd.DataFrame([
+            {'trip_id': trip_id, 'stop_id': stop_id, 'stop_sequence': seq}
+            for trip_id, stop_ids in trips.items()
+            for seq, stop_id in enumerate(stop_ids)
+        ])
+    }
+
+
+def segment_points(geometry, from_stop, to_stop):
+    segment = geometry.segments[('F', from_stop, to_stop)]
+    return list(zip(segment.lats, segment.lons))
+
+
+def test_simplify_line_drops_collinear_points():
+    points = np.array([[0.0, 0.0], [1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+
+    np.testing.assert_array_equal(simplify_line(points, 0.01), [[0.0, 0.0], [3.0, 3.0]])
+
+
+def test_simplify_line_keeps_points_beyond_tolerance():
+    # The corner is kept, the small wobble before it is not
+    points = np.array([[0.0, 0.0], [1.0, 0.001], [2.0, 0.0], [2.0, 1.0]])
+
+    np.testing.assert_array_equal(simplify_line(points, 0.01), [[0.0, 0.0], [2.0, 0.0], [2.0, 1.0]])
+
+
+def test_simplify_line_short_input_unchanged():
+    points = np.array([[0.0, 0.0], [1.0, 1.0]])
+
+    np.testing.assert_array_equal(simplify_line(points), points)
+
+
+def test_stops_between_shape_vertices_get_their_own_piece():
+    feed = make_feed(
+        [(40.03, -74.0), (40.0, -74.0)],
+        [('d', 40.03, -74.0), ('c', 40.02, -74.0), ('b', 40.01, -74.0), ('a', 40.0, -74.0)],
+        {'t1': ['d', 'c', 'b', 'a']}
+    )
+    geometry = build_segment_geometry(feed)
+
+    assert segment_points(geometry, 'd', 'c') == [(40.03, -74.0), (40.02, -74.0)]
+    assert segment_points(geometry, 'c', 'b') == [(40.02, -74.0), (40.01, -74.0)]
+    assert segment_points(geometry, 'b', 'a') == [(40.01, -74.0), (40.0, -74.0)]
+
+
+def test_pieces_start_and_end_at_stop_coordinates():
+    feed = make_feed(
+        [(40.0, -74.0), (40.01, -74.01), (40.02, -74.0), (40.03, -74.01)],
+        [('a', 40.0001, -74.0), ('b', 40.0199, -74.0), ('c', 40.03, -74.0099)],
+        {'t1': ['a', 'b', 'c']}
+    )
+    geometry = build_segment_geometry(feed)
+
+    assert segment_points(geometry, 'a', 'b') == [(40.0001, -74.0), (40.01, -74.01), (40.0199, -74.0)]
+    assert segment_points(geometry, 'b', 'c') == [(40.0199, -74.0), (40.03, -74.0099)]
+
+
+def test_loop_in_shape_does_not_pull_later_stops_forward():
+    # Out along the avenue, around a loop and back past the start to a terminal
+    shape = [(40.0, -74.0), (40.01, -74.0), (40.02, -74.0), (40.02, -74.01),
+             (40.0, -74.01), (40.0, -74.0001), (39.99, -74.0)]
+    feed = make_feed(
+        shape,
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0),
+         ('d', 40.01, -74.01), ('e', 39.99, -74.0)],
+        {'t1': ['a', 'b', 'c', 'd', 'e']}
+    )
+    geometry = build_segment_geometry(feed)
+
+    assert segment_points(geometry, 'a', 'b') == [(40.0, -74.0), (40.01, -74.0)]
+    assert segment_points(geometry, 'b', 'c') == [(40.01, -74.0), (40.02, -74.0)]
+    assert segment_points(geometry, 'c', 'd') == [(40.02, -74.0), (40.02, -74.01), (40.01, -74.01)]
+    assert segment_points(geometry, 'd', 'e')[0] == (40.01, -74.01)
+    assert segment_points(geometry, 'd', 'e')[-1] == (39.99, -74.0)
+
+
+def test_feed_without_shapes_uses_straight_lines():
+    feed = make_feed(
+        [(40.0, -74.0), (40.02, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.01)],
+        {'t1': ['a', 'b']}
+    )
+    del feed['shapes']
+    geometry = build_segment_geometry(feed)
+
+    assert segment_points(geometry, 'a', 'b') == [(40.0, -74.0), (40.01, -74.01)]
+
+
+def test_get_segment_geometry_is_cached_per_feed():
+    feed = make_feed(
+        [(40.0, -74.0), (40.02, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.02, -74.0)],
+        {'t1': ['a', 'b']}
+    )
+
+    assert get_segment_geometry(feed) is get_segment_geometry(feed)
+
+    feed['stops'].loc[1, 'stop_lat'] = 40.03
+    assert ('F', 'a', 'b') in get_segment_geometry(feed).segments
+    assert segment_points(get_segment_geometry(feed), 'a', 'b')[-1] == (40.03, -74.0)
+
+
+def test_get_stop_patterns_is_cached_per_feed():
+    feed = make_feed(
+        [(40.0, -74.0), (40.02, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0)],
+        {'t1': ['a', 'b', 'c']}
+    )
+
+    patterns = get_stop_patterns(feed)
+    assert get_stop_patterns(feed) is patterns
+    assert patterns == GTFSParser().get_stop_patterns(feed)
+
+    # A changed stop sequence is a different feed
+    feed['stop_times'].loc[1, 'stop_id'] = 'c'
+    feed['stop_times'].loc[2, 'stop_id'] = 'b'
+    assert get_stop_patterns(feed)['F']['direction_0'] == [{'stop_ids': ('a', 'c', 'b'), 'count': 1}]
+
+
+def test_get_stop_patterns_counts_distinct_patterns():
+    feed = make_feed(
+        [(40.0, -74.0), (40.03, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0), ('d', 40.03, -74.0)],
+        {'t1': ['a', 'b', 'c', 'd'], 't2': ['a', 'b', 'c', 'd'], 't3': ['a', 'b', 'd']}
+    )
+    # Stop times out of order must still give the right sequence
+    feed['stop_times'] = feed['stop_times'].iloc[::-1]
+
+    patterns = GTFSParser().get_stop_patterns(feed)
+
+    assert patterns == {
+        'F': {
+            'direction_0': [
+                {'stop_ids': ('a', 'b', 'c', 'd'), 'count': 2},
+                {'stop_ids': ('a', 'b', 'd'), 'count': 1}
+            ],
+            'direction_1': []
+        }
+    }
+
+
+def test_segments_from_comparison_marks_segments_around_skipped_stops():
+    regular = make_feed(
+        [(40.0, -74.0), (40.03, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0), ('d', 40.03, -74.0)],
+        {'t1': ['a', 'b', 'c', 'd']}
+    )
+    supplemented = make_feed(
+        [(40.0, -74.0), (40.03, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0), ('d', 40.03, -74.0)],
+        {'t1': ['a', 'b', 'c', 'd'], 't2': ['a', 'b', 'd'], 't3': ['a', 'b', 'd']}
+    )
+    geometry = build_segment_geometry(regular)
+    parser = GTFSParser()
+    differences = GTFSComparator().compare_route_patterns(
+        parser.get_stop_patterns(regular)['F'],
+        parser.get_stop_patterns(supplemented)['F']
+    )
+
+    affected = segments_from_comparison(geometry, 'F', differences)
+
+    assert sorted((item.segment.from_stop_id, item.segment.to_stop_id) for item in affected) == [
+        ('b', 'c'), ('c', 'd')
+    ]
+    assert {item.status for item in affected} == {'skip_stops'}
+    assert {item.detail for item in affected} == {'2 trips'}
+
+
+def test_segments_from_comparison_without_skipped_stops():
+    geometry = build_segment_geometry(make_feed(
+        [(40.0, -74.0), (40.01, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0)],
+        {'t1': ['a', 'b']}
+    ))
+    differences = {'direction_0': [{'pattern_type': 'rerouted', 'skipped_stops': [],
+                                     'added_stops': ['x'], 'trips_affected': 3}],
+                   'direction_1': []}
+
+    assert segments_from_comparison(geometry, 'F', differences) == []
+
+
+def test_comparing_feed_with_itself_has_no_affected_segments():
+    # A regular short-turn variant must not be reported as skipping stops
+    feed = make_feed(
+        [(40.0, -74.0), (40.03, -74.0)],
+        [('a', 40.0, -74.0), ('b', 40.01, -74.0), ('c', 40.02, -74.0), ('d', 40.03, -74.0)],
+        {'t1': ['a', 'b', 'c', 'd'], 't2': ['a', 'b', 'c', 'd'], 't3': ['a', 'b', 'c']}
+    )
+    patterns = GTFSParser().get_stop_patterns(feed)
+    differences = GTFSComparator().compare_route_patterns(patterns['F'], patterns['F'])
+
+    assert differences == {'direction_0': [], 'direction_1': []}
+    assert segments_from_comparison(build_segment_geometry(feed), 'F', differences) == []
@@ -0,0 +1,141 @@
+# utils/alert_monitor.py
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from utils.data_fetcher import PSDataFetcher
+from utils.data_handler import Alert
+from utils.metrics import span, increment
+from utils.ps_processor import PSProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class AlertMonitor:
+    """Poll the alerts feed and only reprocess entities that changed.
+
+    Each entity is hashed on every poll; new and changed alerts go through
+    categorization (and the optional parser), removed alerts are reported
+    from the previous result. Unchanged alerts cost one hash per poll.
+    If any route fails to fetch, removals are not reported for that poll,
+    since a missing alert may just be on the failed route. An entity that
+    fails to process keeps its previous result and is retried next poll.
+    """
+
+    def __init__(self,
+                 start_date: datetime,
+                 end_date: datetime,
+                 fetcher: Optional[PSDataFetcher] = None,
+                 processor: Optional[PSProcessor] = None,
+                 parser=None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.fetcher = fetcher or PSDataFetcher()
+        self.processor = processor or PSProcessor()
+        self.parser = parser  # Any BaseParser, e.g. registry.get('gpt')
+        self.hashes: Dict[str, str] = {}
+        self.results: Dict[str, Dict] = {}
+        self.alerts: Dict[str, Alert] = {}
+        self.failed_routes: Dict[str, str] = {}
+        self.failed_alerts: Dict[str, str] = {}
+        self.poll_count = 0
+        self.last_polled_at: Optional[datetime] = None
+
+    @staticmethod
+    def _hash_entity(entity: Dict) -> str:
+        return hashlib.sha1(json.dumps(entity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _entity_id(entity: Dict, entity_hash: str) -> str:
+        return str(entity.get('id') or entity_hash)
+
+    def _process_entity(self, entity: Dict) -> Optional[Alert]:
+        alert = self.processor.process_alert(Alert.from_entity(entity))
+        if alert is not None and self.parser is not None:
+            alert.parse_result = self.parser.parse_result(alert.text)
+        return alert
+
+    @staticmethod
+    def _result_row(alert: Alert) -> Dict:
+        result = {'Category': alert.category, **alert.to_summary_row()}
+        if alert.parse_result is not None:
+            result['Parsed'] = alert.parse_result.to_dict()
+        return result
+
+    def poll(self) -> List[Dict]:
+        """Fetch the feed once and return change events since the last poll"""
+        with span("AlertMonitor.poll") as attrs:
+            data = self.fetcher.fetch_all_lines(self.start_date, self.end_date)
+            polled_at = datetime.now()
+            self.failed_routes = data.get('failed_routes', {})
+
+            # The same alert comes back once per informed route, keep one copy
+            current = {}
+            for entity in data.get('entity', []):
+                if 'alert' not in entity:
+                    continue
+                entity_hash = self._hash_entity(entity)
+                current[self._entity_id(entity, entity_hash)] = (entity_hash, entity)
+
+            events = []
+            self.failed_alerts = {}
+            for alert_id, (entity_hash, entity) in current.items():
+                previous_hash = self.hashes.get(alert_id)
+                if previous_hash == entity_hash:
+                    increment("monitor_unchanged")
+                    continue
+
+                try:
+                    alert = self._process_entity(entity)
+                    result = self._result_row(alert) if alert is not None else None
+                except Exception as e:
+                    # Leave the hash alone so the entity is retried on the next poll
+                    logger.exception("Failed to process alert %s", alert_id)
+                    self.failed_alerts[alert_id] = str(e)
+                    increment("monitor_errors")
+                    continue
+
+                if alert is None:
+                    # Filtered out (e.g. Reduced Service); report removal if it was shown before
+                    if alert_id in self.results:
+                        self.alerts.pop(alert_id)
+                        events.append(self._event('removed', alert_id, self.results.pop(alert_id), polled_at))
+                    self.hashes[alert_id] = entity_hash
+                    continue
+
+                change = 'new' if alert_id not in self.results else 'changed'
+                self.alerts[alert_id] = alert
+                self.results[alert_id] = result
+                self.hashes[alert_id] = entity_hash
+                events.append(self._event(change, alert_id, result, polled_at))
+
+            if not self.failed_routes:
+                for alert_id in set(self.hashes) - set(current):
+                    del self.hashes[alert_id]
+                    if alert_id in self.results:
+                        self.alerts.pop(alert_id)
+                        events.append(self._event('removed', alert_id, self.results.pop(alert_id), polled_at))
+
+            self.poll_count += 1
+            self.last_polled_at = polled_at
+            attrs['active_alerts'] = len(current)
+            attrs['changes'] = len(events)
+            attrs['failed_routes'] = len(self.failed_routes)
+            attrs['failed_alerts'] = len(self.failed_alerts)
+            increment("monitor_polls")
+            increment("monitor_changes", len(events))
+
+        return events
+
+    def seconds_until_next_poll(self, interval: float) -> float:
+        """Time left before a poll is due, 0 if never polled or already due"""
+        if self.last_polled_at is None:
+            return 0.0
+        elapsed = (datetime.now() - self.last_polled_at).total_seconds()
+        return max(0.0, interval - elapsed)
+
+    @staticmethod
+    def _event(change: str, alert_id: str, result: Dict, polled_at: datetime) -> Dict:
+        return {'Detected At': polled_at, 'Change': change, 'Alert ID': alert_id, **result}
@@ -1,6 +1,7 @@
 import requests
 from datetime import datetime
 from typing import Dict
+from utils.metrics import span, increment
 
 class PSDataFetcher:
     def __init__(self):
@@ -19,9 +20,29 @@ class PSDataFetcher:
             "endDate": end_date.strftime("%Y-%m-%dT%H:%M:%S")
         }
         
-        try:
-            response = requests.get(self.base_url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": str(e)}
\ No newline at end of file
+        with span("PSDataFetcher.fetch_alerts", route_id=route_id) as attrs:
+            increment("api_calls")
+            try:
+                response = requests.get(self.base_url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                attrs['entities'] = len(data.get('entity', []))
+                return data
+            except requests.RequestException as e:
+                increment("api_errors")
+                return {"error": str(e)}
+
+    def fetch_all_lines(self, start_date: datetime, end_date: datetime) -> Dict:
+        """Fetch alerts for every subway line and merge them into one feed.
+
+        Routes whose request failed are listed in `failed_routes` (route -> error)
+        so callers can tell missing data apart from an empty feed.
+        """
+        all_data = {"entity": [], "failed_routes": {}}
+        for route in self.subway_lines:
+            route_data = self.fetch_alerts(route, start_date, end_date)
+            if 'error' in route_data:
+                all_data["failed_routes"][route] = route_data["error"]
+            elif 'entity' in route_data:
+                all_data["entity"].extend(route_data["entity"])
+        return all_data
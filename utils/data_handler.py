@@ -0,0 +1,85 @@
+# utils/data_handler.py
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from parsers.base_parser import ParseResult
+
+MERCURY_KEY = 'transit_realtime.mercury_alert'
+
+
+def _translation(value: Dict) -> str:
+    """First translation text of a GTFS-rt TranslatedString"""
+    translations = (value or {}).get('translation') or [{}]
+    return translations[0].get('text', '')
+
+
+@dataclass(slots=True)
+class Alert:
+    """Normalized service alert, built once from a GTFS-rt feed entity.
+
+    Only the fields the app uses are kept, so the raw nested entity can be
+    dropped after ingest. Small repeated strings (route ids, alert types)
+    are interned to share memory across large archives.
+    """
+    alert_id: str
+    alert_type: str
+    header: str
+    description: str
+    routes: Tuple[str, ...]
+    active_period: str
+    start_time: Optional[datetime] = None
+    category: Optional[str] = None
+    parse_result: Optional['ParseResult'] = None
+
+    @classmethod
+    def from_entity(cls, entity: Dict) -> 'Alert':
+        alert = entity['alert']
+        mercury = alert.get(MERCURY_KEY, {})
+
+        start = min((period.get('start', float('inf'))
+                     for period in alert.get('active_period', [])), default=float('inf'))
+
+        routes = sorted({
+            sys.intern(informed['route_id'])
+            for informed in alert.get('informed_entity', [])
+            if 'route_id' in informed
+        })
+
+        return cls(
+            alert_id=str(entity.get('id', '')),
+            alert_type=sys.intern(mercury.get('alert_type', '')),
+            header=_translation(alert.get('header_text')),
+            description=_translation(alert.get('description_text')),
+            routes=tuple(routes),
+            active_period=_translation(mercury.get('human_readable_active_period')),
+            start_time=datetime.fromtimestamp(start) if start != float('inf') else None
+        )
+
+    @property
+    def is_reduced_service(self) -> bool:
+        return 'Reduced Service' in self.alert_type
+
+    @property
+    def text(self) -> str:
+        """Header and description, as passed to the text parsers"""
+        return f"{self.header}\n{self.description}"
+
+    def to_summary_row(self) -> Dict:
+        """Row used by the categorized summary sheets"""
+        return {
+            'Line': ', '.join(self.routes),
+            'Date': self.active_period,
+            'Type': self.alert_type,
+            'Impact': self.header,
+            'Description': self.description,
+            'In GTFS': '',
+            'Notes': ''
+        }
+
+
+def normalize_alerts(data: Dict) -> List[Alert]:
+    """Convert a GTFS-rt alerts feed into Alert records"""
+    return [Alert.from_entity(entity) for entity in data.get('entity', []) if 'alert' in entity]
@@ -14,9 +14,17 @@ class GTFSComparator:
         for direction in ['direction_0', 'direction_1']:
             reg_patterns = regular_patterns.get(direction, [])
             supp_patterns = supplemented_patterns.get(direction, [])
+            if not reg_patterns:
+                continue
+            
+            # Variants that also run in the regular feed (short turns, etc.) aren't changes
+            regular_stop_ids = {pattern['stop_ids'] for pattern in reg_patterns}
             
             # Compare each supplemented pattern with regular patterns
             for supp_pattern in supp_patterns:
+                if supp_pattern['stop_ids'] in regular_stop_ids:
+                    continue
+                
                 pattern_diff = {
                     'pattern_type': self._categorize_pattern_change(
                         reg_patterns[0]['stop_ids'],  # Using main pattern as reference
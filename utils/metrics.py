@@ -0,0 +1,125 @@
+# utils/metrics.py
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+
+class MetricsRegistry:
+    """In-process store for timing spans, counters and memory snapshots"""
+
+    def __init__(self, max_spans: int = 2000, max_snapshots: int = 200):
+        self.spans = deque(maxlen=max_spans)
+        self.memory_snapshots = deque(maxlen=max_snapshots)
+        self.counters = defaultdict(int)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time a block of code and record it as a span.
+
+        The yielded dict can be updated inside the block to attach extra
+        attributes (e.g. result sizes) to the recorded span.
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        started_at = datetime.now()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            with self._lock:
+                self.spans.append({
+                    'name': name,
+                    'parent': parent,
+                    'started_at': started_at,
+                    'duration_ms': duration * 1000,
+                    'error': error,
+                    'attributes': dict(attributes)
+                })
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording every call of the wrapped function as a span"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, name: str, value: int = 1):
+        """Increase a named counter (API calls, cache hits, tokens, ...)"""
+        with self._lock:
+            self.counters[name] += value
+
+    def start_memory_tracing(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop_memory_tracing(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def snapshot_memory(self, label: str) -> Optional[Dict]:
+        """Record current/peak traced memory; no-op unless tracing is on"""
+        if not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = {
+            'label': label,
+            'taken_at': datetime.now(),
+            'current_mb': current / 1024 / 1024,
+            'peak_mb': peak / 1024 / 1024
+        }
+        with self._lock:
+            self.memory_snapshots.append(snapshot)
+        return snapshot
+
+    def get_spans(self) -> List[Dict]:
+        with self._lock:
+            return list(self.spans)
+
+    def get_counters(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+    def get_memory_snapshots(self) -> List[Dict]:
+        with self._lock:
+            return list(self.memory_snapshots)
+
+    def slowest_spans(self, limit: int = 20) -> List[Dict]:
+        return sorted(self.get_spans(), key=lambda s: s['duration_ms'], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.memory_snapshots.clear()
+            self.counters.clear()
+
+
+# Shared registry; Streamlit keeps imported modules alive across reruns,
+# so everything recorded here is visible to the diagnostics page.
+metrics = MetricsRegistry()
+span = metrics.span
+timed = metrics.timed
+increment = metrics.increment
@@ -0,0 +1,246 @@
+# utils/ps_batch.py
+"""Headless PS summary generation.
+
+Generate a summary for a date range:
+    python -m utils.ps_batch --start 2025-02-03 --end 2025-02-07
+
+Precompute the upcoming weekend/weekday windows used by the PS Data Viewer
+(suitable for a cron job, e.g. every hour):
+    python -m utils.ps_batch --upcoming
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_fetcher import PSDataFetcher
+from utils.metrics import span, increment
+from utils.ps_processor import PSProcessor
+
+DEFAULT_OUTPUT_DIR = os.getenv("PS_PRECOMPUTED_DIR", "precomputed")
+# Older summaries are ignored by the viewer, which then fetches live data
+DEFAULT_MAX_AGE_HOURS = float(os.getenv("PS_PRECOMPUTED_MAX_AGE_HOURS", "6"))
+
+
+class FetchFailedError(RuntimeError):
+    """Raised when one or more routes could not be fetched"""
+
+    def __init__(self, failed_routes: Dict[str, str]):
+        self.failed_routes = failed_routes
+        super().__init__(f"Failed to fetch routes: {', '.join(sorted(failed_routes))}")
+
+
+class ExcelExportError(RuntimeError):
+    """Raised when Excel output was requested but could not be created"""
+
+
+def get_upcoming_windows(today: datetime) -> Dict[str, Tuple[date, date]]:
+    """Date windows the viewer's "Weekend/Weekday" mode asks for"""
+    days_to_weekend = (5 - today.weekday()) % 7
+    next_weekend = today + timedelta(days=days_to_weekend)
+    next_weekday = today + timedelta(days=(7 - today.weekday()) % 7 + 1)
+    return {
+        'weekend': (next_weekend.date(), (next_weekend + timedelta(days=1)).date()),
+        'weekday': (next_weekday.date(), next_weekday.date())
+    }
+
+
+def get_summary_dir(output_dir: str, start_date: date, end_date: date) -> Path:
+    return Path(output_dir) / f"ps_summary_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+
+
+def generate_summary(fetcher: PSDataFetcher,
+                     processor: PSProcessor,
+                     start_date: date,
+                     end_date: date) -> Tuple[Dict[str, pd.DataFrame], int]:
+    """Fetch all lines for the range and categorize the alerts.
+
+    Raises FetchFailedError if any route failed, so a partial feed is never
+    written out as if it were complete.
+    """
+    start_datetime = datetime.combine(start_date, datetime.min.time())
+    end_datetime = datetime.combine(end_date, datetime.max.time())
+
+    all_data = fetcher.fetch_all_lines(start_datetime, end_datetime)
+    if all_data["failed_routes"]:
+        raise FetchFailedError(all_data["failed_routes"])
+    return processor.process_alerts_to_summary(all_data), len(all_data["entity"])
+
+
+def write_summary(processor: PSProcessor,
+                  categorized_dfs: Dict[str, pd.DataFrame],
+                  start_date: date,
+                  end_date: date,
+                  alert_count: int,
+                  output_dir: str = DEFAULT_OUTPUT_DIR,
+                  formats: Tuple[str, ...] = ("excel", "parquet")) -> Path:
+    """Write Excel/Parquet outputs plus a manifest the viewer can read back.
+
+    Everything is written to a temporary directory that is then swapped in,
+    so readers never see new files next to an old manifest and categories
+    from a previous run don't linger. Raises ExcelExportError if the Excel
+    file can't be created; nothing is written in that case.
+    """
+    summary_dir = get_summary_dir(output_dir, start_date, end_date)
+    summary_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{summary_dir.name}.", dir=summary_dir.parent))
+
+    try:
+        with span("write_summary", summary_dir=str(summary_dir)):
+            written_formats = []
+            # A workbook needs at least one sheet, so windows without alerts get no Excel file
+            if "excel" in formats and categorized_dfs:
+                excel_data = processor.create_excel_summary(categorized_dfs)
+                if not excel_data:
+                    raise ExcelExportError(f"Could not create Excel summary for {summary_dir.name}")
+                (tmp_dir / f"PS_Summary_{start_date:%Y%m%d}.xlsx").write_bytes(excel_data)
+                written_formats.append("excel")
+
+            if "parquet" in formats:
+                for category, df in categorized_dfs.items():
+                    df.to_parquet(tmp_dir / f"{category}.parquet", index=False)
+                written_formats.append("parquet")
+
+            manifest = {
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'alert_count': alert_count,
+                'categories': list(categorized_dfs.keys()),
+                'formats': written_formats
+            }
+            (tmp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+            # A non-empty directory can't be replaced directly: move the old one
+            # aside first. Readers in between see no manifest and fetch live.
+            old_dir = None
+            if summary_dir.exists():
+                old_dir = summary_dir.with_name(f"{tmp_dir.name}.old")
+                os.replace(summary_dir, old_dir)
+            os.replace(tmp_dir, summary_dir)
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return summary_dir
+
+
+def load_precomputed_summary(start_date: date,
+                             end_date: date,
+                             output_dir: str = DEFAULT_OUTPUT_DIR,
+                             max_age_hours: float = DEFAULT_MAX_AGE_HOURS) -> Optional[Dict]:
+    """Load a precomputed summary, or None if there isn't a usable one.
+
+    Summaries generated more than `max_age_hours` ago count as missing, so
+    a stopped cron job doesn't leave the viewer serving stale alerts.
+    Returns a dict with the manifest, the categorized DataFrames and the
+    Excel bytes (None if no Excel file was written).
+    """
+    summary_dir = get_summary_dir(output_dir, start_date, end_date)
+    manifest_path = summary_dir / "manifest.json"
+    if not manifest_path.exists():
+        increment("precomputed_misses")
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+        if "parquet" not in manifest['formats']:
+            increment("precomputed_misses")
+            return None
+
+        age = datetime.now() - datetime.fromisoformat(manifest['generated_at'])
+        if age > timedelta(hours=max_age_hours):
+            increment("precomputed_stale")
+            increment("precomputed_misses")
+            return None
+
+        categorized_dfs = {
+            category: pd.read_parquet(summary_dir / f"{category}.parquet")
+            for category in manifest['categories']
+        }
+        excel_path = summary_dir / f"PS_Summary_{start_date:%Y%m%d}.xlsx"
+        excel_data = excel_path.read_bytes() if excel_path.exists() else None
+    except (OSError, ValueError, KeyError):
+        increment("precomputed_misses")
+        return None
+
+    increment("precomputed_hits")
+    return {
+        'manifest': manifest,
+        'categorized_dfs': categorized_dfs,
+        'excel_data': excel_data
+    }
+
+
+def run(start_date: date,
+        end_date: date,
+        output_dir: str = DEFAULT_OUTPUT_DIR,
+        formats: Tuple[str, ...] = ("excel", "parquet"),
+        fetcher: Optional[PSDataFetcher] = None,
+        processor: Optional[PSProcessor] = None) -> Path:
+    """Generate and write the summary for a single date range"""
+    fetcher = fetcher or PSDataFetcher()
+    processor = processor or PSProcessor()
+
+    categorized_dfs, alert_count = generate_summary(fetcher, processor, start_date, end_date)
+    summary_dir = write_summary(
+        processor, categorized_dfs, start_date, end_date, alert_count, output_dir, formats
+    )
+    print(f"{start_date} to {end_date}: {alert_count} alerts -> {summary_dir}")
+    return summary_dir
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate PS summaries without the Streamlit UI")
+    parser.add_argument("--start", type=_parse_date, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=_parse_date, help="End date (YYYY-MM-DD), defaults to --start")
+    parser.add_argument("--upcoming", action="store_true",
+                        help="Precompute the upcoming weekend and weekday windows")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR,
+                        help=f"Where to write summaries (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=["excel", "parquet"],
+                        default=["excel", "parquet"], help="Output formats")
+    args = parser.parse_args(argv)
+
+    if not args.start and not args.upcoming:
+        parser.error("one of --start or --upcoming is required")
+
+    windows = []
+    if args.start:
+        end_date = args.end or args.start
+        if end_date < args.start:
+            parser.error("--end must not be before --start")
+        windows.append((args.start, end_date))
+    if args.upcoming:
+        windows.extend(get_upcoming_windows(datetime.now()).values())
+
+    fetcher = PSDataFetcher()
+    processor = PSProcessor()
+    failed = False
+    for start_date, end_date in windows:
+        try:
+            run(start_date, end_date, args.output_dir, tuple(args.formats), fetcher, processor)
+        except (FetchFailedError, ExcelExportError) as e:
+            # Keep any previous summary for this window rather than writing a partial one
+            print(f"{start_date} to {end_date}: {e}; summary not written", file=sys.stderr)
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 import pandas as pd
-from datetime import datetime
 import io
-import streamlit as st
+from utils.data_handler import Alert, normalize_alerts
+from utils.metrics import timed
 
 class PSProcessor:
     def __init__(self):
@@ -13,27 +13,28 @@ class PSProcessor:
             'suspended': ['suspended', 'no service', 'not running']
         }
 
-    def process_single_line_alerts(self, data: Dict) -> pd.DataFrame:
+    @timed()
+    def normalize_alerts(self, data: Dict) -> List[Alert]:
+        """Convert the raw alerts feed into Alert records (done once at ingest)"""
+        return normalize_alerts(data)
+
+    @timed()
+    def process_single_line_alerts(self, data: Union[Dict, List[Alert]]) -> pd.DataFrame:
         """Process alerts for single line detailed view"""
+        if isinstance(data, dict):
+            data = self.normalize_alerts(data)
+        
         alerts = []
-        for entity in data.get('entity', []):
-            if 'alert' in entity:
-                alert = entity['alert']
-                alert_type = alert.get('transit_realtime.mercury_alert', {}).get('alert_type', '')
-                
-                if 'Reduced Service' in alert_type:
-                    continue
-                    
-                active_periods = alert.get('active_period', [])
-                start_time = min((period.get('start', float('inf')) 
-                                for period in active_periods), default=float('inf'))
-                
-                alerts.append({
-                    'Start Time': datetime.fromtimestamp(start_time) if start_time != float('inf') else None,
-                    'Type': alert_type,
-                    'Header': alert.get('header_text', {}).get('translation', [{}])[0].get('text', ''),
-                    'Period': alert.get('transit_realtime.mercury_alert', {}).get('human_readable_active_period', {}).get('translation', [{}])[0].get('text', '')
-                })
+        for alert in data:
+            if alert.is_reduced_service:
+                continue
+            
+            alerts.append({
+                'Start Time': alert.start_time,
+                'Type': alert.alert_type,
+                'Header': alert.header,
+                'Period': alert.active_period
+            })
         
         df = pd.DataFrame(alerts)
         if not df.empty and 'Start Time' in df.columns:
@@ -55,8 +56,20 @@ class PSProcessor:
         else:
             return 'Other'
 
-    def process_alerts_to_summary(self, data: Dict) -> Dict[str, pd.DataFrame]:
-        """Process alerts into categorized DataFrames"""
+    def process_alert(self, alert: Alert) -> Optional[Alert]:
+        """Categorize a single alert in place (None if filtered out)"""
+        if alert.is_reduced_service:
+            return None
+        
+        alert.category = self.categorize_alert(alert.header, alert.description, alert.alert_type)
+        return alert
+
+    @timed()
+    def process_alerts_to_summary(self, data: Union[Dict, List[Alert]]) -> Dict[str, pd.DataFrame]:
+        """Process alerts (raw feed or normalized) into categorized DataFrames"""
+        if isinstance(data, dict):
+            data = self.normalize_alerts(data)
+        
         categories_data = {
             'Replacement Shuttles': [],
             'Reroute': [],
@@ -65,38 +78,13 @@ class PSProcessor:
             'Other': []
         }
         
-        for entity in data.get('entity', []):
-            if 'alert' in entity:
-                alert = entity['alert']
-                
-                alert_type = alert.get('transit_realtime.mercury_alert', {}).get('alert_type', '')
-                if 'Reduced Service' in alert_type:
-                    continue
-                
-                header = alert.get('header_text', {}).get('translation', [{}])[0].get('text', '')
-                desc = alert.get('description_text', {}).get('translation', [{}])[0].get('text', '')
-                
-                routes = []
-                for informed in alert.get('informed_entity', []):
-                    if 'route_id' in informed:
-                        routes.append(informed['route_id'])
-                
-                category = self.categorize_alert(header, desc, alert_type)
-                
-                alert_data = {
-                    'Line': ', '.join(sorted(set(routes))),
-                    'Date': alert.get('transit_realtime.mercury_alert', {}).get('human_readable_active_period', {}).get('translation', [{}])[0].get('text', ''),
-                    'Type': alert_type,
-                    'Impact': header,
-                    'Description': desc,
-                    'In GTFS': '',
-                    'Notes': ''
-                }
-                
-                categories_data[category].append(alert_data)
+        for alert in data:
+            if self.process_alert(alert) is not None:
+                categories_data[alert.category].append(alert.to_summary_row())
         
         return {category: pd.DataFrame(data) for category, data in categories_data.items() if data}
 
+    @timed()
     def create_excel_summary(self, categorized_dfs: Dict[str, pd.DataFrame]) -> bytes:
         """Create formatted Excel file with multiple sheets for each category"""
         buffer = io.BytesIO()
@@ -127,5 +115,7 @@ class PSProcessor:
             buffer.seek(0)
             return buffer.getvalue()
         except Exception as e:
+            # Imported here so the batch CLI doesn't pay for Streamlit
+            import streamlit as st
             st.error(f"Error creating Excel file: {str(e)}")
             return None
\ No newline at end of file
@@ -0,0 +1,412 @@
+# utils/visualization.py
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from parsers.base_parser import ParseResult
+from parsers.gtfs_parser import GTFSParser
+from utils.metrics import span, timed, increment
+
+# ~10 m at NYC latitudes; plenty for a system-wide map
+DEFAULT_TOLERANCE = 0.0001
+MAX_CACHED_FEEDS = 4
+
+# How far along the shape the next stop may be, relative to the straight-line
+# distance between consecutive stops (with a floor of ~200 m)
+LOOKAHEAD_FACTOR = 3.0
+MIN_LOOKAHEAD = 0.002
+# Candidates within ~10 m of the closest projection count as ties
+SNAP_TOLERANCE = 0.0001
+
+STATUS_COLORS = {
+    'skip_stops': '#ff7f0e',
+    'rerouted': '#9467bd',
+    'running_sections': '#d62728',
+    'suspension': '#d62728',
+    'reroute': '#9467bd',
+    'affected': '#ff7f0e'
+}
+
+
+def simplify_line(points: np.ndarray, tolerance: float = DEFAULT_TOLERANCE) -> np.ndarray:
+    """Douglas-Peucker simplification of an (n, 2) array of lat/lon points"""
+    if len(points) < 3:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        inner = points[start + 1:end]
+        line = points[end] - points[start]
+        line_length = np.hypot(line[0], line[1])
+        if line_length == 0:
+            distances = np.hypot(*(inner - points[start]).T)
+        else:
+            offsets = inner - points[start]
+            distances = np.abs(line[0] * offsets[:, 1] - line[1] * offsets[:, 0]) / line_length
+
+        max_idx = int(np.argmax(distances))
+        if distances[max_idx] > tolerance:
+            split = start + 1 + max_idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return points[keep]
+
+
+@dataclass(slots=True)
+class RouteSegment:
+    """Simplified geometry between two consecutive stops of a route"""
+    route_id: str
+    from_stop_id: str
+    to_stop_id: str
+    lats: Tuple[float, ...]
+    lons: Tuple[float, ...]
+
+
+@dataclass(slots=True)
+class AffectedSegment:
+    segment: RouteSegment
+    status: str
+    detail: str = ""
+
+
+@dataclass(slots=True)
+class SegmentGeometry:
+    """Per-feed segment geometry plus the stop lookups needed to map results"""
+    segments: Dict[Tuple[str, str, str], RouteSegment] = field(default_factory=dict)
+    route_sequences: Dict[str, List[Tuple[str, ...]]] = field(default_factory=dict)
+    stop_coords: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    stop_names: Dict[str, str] = field(default_factory=dict)
+    name_index: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def route_segments(self, route_id: str) -> List[RouteSegment]:
+        return [segment for key, segment in self.segments.items() if key[0] == route_id]
+
+    def stop_ids_for_name(self, name: str) -> Set[str]:
+        return self.name_index.get(name.strip().lower(), set())
+
+
+def _project_stops(shape_points: np.ndarray, stop_points: np.ndarray) -> List[Tuple[int, float]]:
+    """Position of each stop along the shape as (line segment index, fraction).
+
+    Stops are projected onto the shape's line segments, never moving
+    backwards, and the search only reaches LOOKAHEAD_FACTOR times the
+    straight-line distance to the previous stop further along the shape, so
+    a shape that loops back near an earlier point can't pull every later
+    stop onto the loop. Among near-equal candidates the earliest wins.
+    """
+    starts = shape_points[:-1]
+    vectors = shape_points[1:] - starts
+    lengths_sq = (vectors ** 2).sum(axis=1)
+    lengths = np.sqrt(lengths_sq)
+    cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+    safe_lengths_sq = np.where(lengths_sq == 0, 1.0, lengths_sq)
+
+    positions = []
+    segment, fraction = 0, 0.0
+    for idx, stop in enumerate(stop_points):
+        if idx == 0:
+            last = len(starts)
+        else:
+            reach = max(LOOKAHEAD_FACTOR * float(np.hypot(*(stop - stop_points[idx - 1]))), MIN_LOOKAHEAD)
+            limit = cumulative[segment] + fraction * lengths[segment] + reach
+            last = max(segment + 1, int(np.searchsorted(cumulative[:-1], limit, side='right')))
+
+        candidates = slice(segment, last)
+        offsets = stop - starts[candidates]
+        t = (offsets * vectors[candidates]).sum(axis=1) / safe_lengths_sq[candidates]
+        lower = np.zeros(len(t))
+        lower[0] = fraction
+        t = np.clip(t, lower, 1.0)
+        projected = starts[candidates] + t[:, None] * vectors[candidates]
+        distances = np.hypot(*(projected - stop).T)
+
+        best = int(np.argmax(distances <= distances.min() + SNAP_TOLERANCE))
+        segment, fraction = segment + best, float(t[best])
+        positions.append((segment, fraction))
+    return positions
+
+
+def _shape_piece(shape_points: np.ndarray,
+                 from_position: Tuple[int, float],
+                 to_position: Tuple[int, float],
+                 from_stop: np.ndarray,
+                 to_stop: np.ndarray) -> np.ndarray:
+    """Shape vertices between two projected stops, anchored at the stop coordinates"""
+    inner = shape_points[from_position[0] + 1:to_position[0] + 1]
+    return np.vstack((from_stop, inner, to_stop))
+
+
+@timed()
+def build_segment_geometry(gtfs_data: Dict[str, pd.DataFrame],
+                           tolerance: float = DEFAULT_TOLERANCE) -> SegmentGeometry:
+    """Precompute simplified stop-to-stop geometry for every route in a feed.
+
+    One representative trip per (route, shape) gives the stop order; its
+    shape is cut at the stops and each piece simplified. Feeds without
+    shapes.txt fall back to straight lines between stops.
+    """
+    geometry = SegmentGeometry()
+
+    stops = gtfs_data['stops']
+    for row in stops[['stop_id', 'stop_name', 'stop_lat', 'stop_lon']].itertuples(index=False):
+        stop_id = str(row.stop_id)
+        geometry.stop_coords[stop_id] = (row.stop_lat, row.stop_lon)
+        geometry.stop_names[stop_id] = row.stop_name
+        geometry.name_index.setdefault(str(row.stop_name).strip().lower(), set()).add(stop_id)
+
+    trips = gtfs_data['trips']
+    has_shapes = 'shapes' in gtfs_data and 'shape_id' in trips.columns
+    group_column = 'shape_id' if has_shapes else 'direction_id'
+    representative = trips.drop_duplicates(['route_id', group_column])
+
+    stop_times = gtfs_data['stop_times']
+    stop_times = stop_times[stop_times['trip_id'].isin(representative['trip_id'])]
+    trip_stops = stop_times.sort_values(['trip_id', 'stop_sequence']).groupby('trip_id')['stop_id'].agg(tuple)
+
+    shape_points = {}
+    if has_shapes:
+        shapes = gtfs_data['shapes'].sort_values(['shape_id', 'shape_pt_sequence'])
+        for shape_id, points in shapes.groupby('shape_id'):
+            shape_points[shape_id] = points[['shape_pt_lat', 'shape_pt_lon']].to_numpy(dtype=float)
+
+    for trip in representative.itertuples(index=False):
+        stop_ids = tuple(str(stop_id) for stop_id in trip_stops.get(trip.trip_id, ()))
+        stop_ids = tuple(stop_id for stop_id in stop_ids if stop_id in geometry.stop_coords)
+        if len(stop_ids) < 2:
+            continue
+
+        route_id = str(trip.route_id)
+        geometry.route_sequences.setdefault(route_id, []).append(stop_ids)
+
+        stop_points = np.array([geometry.stop_coords[stop_id] for stop_id in stop_ids], dtype=float)
+        points = shape_points.get(getattr(trip, 'shape_id', None)) if has_shapes else None
+        positions = _project_stops(points, stop_points) if points is not None and len(points) > 1 else None
+
+        for idx, (from_stop, to_stop) in enumerate(zip(stop_ids, stop_ids[1:])):
+            key = (route_id, from_stop, to_stop)
+            if key in geometry.segments:
+                continue
+
+            if positions is not None:
+                piece = simplify_line(_shape_piece(
+                    points, positions[idx], positions[idx + 1], stop_points[idx], stop_points[idx + 1]
+                ), tolerance)
+            else:
+                piece = stop_points[idx:idx + 2]
+
+            geometry.segments[key] = RouteSegment(
+                route_id=route_id,
+                from_stop_id=from_stop,
+                to_stop_id=to_stop,
+                lats=tuple(piece[:, 0].tolist()),
+                lons=tuple(piece[:, 1].tolist())
+            )
+
+    return geometry
+
+
+_geometry_cache: 'OrderedDict[Tuple, SegmentGeometry]' = OrderedDict()
+_pattern_cache: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+
+
+def _feed_key(gtfs_data: Dict[str, pd.DataFrame], tolerance: float) -> Tuple:
+    parts = [tolerance, len(gtfs_data['stop_times'])]
+    for name in ('shapes', 'trips', 'stops'):
+        if name in gtfs_data:
+            parts.append(int(pd.util.hash_pandas_object(gtfs_data[name], index=False).sum()))
+    return tuple(parts)
+
+
+def _pattern_key(gtfs_data: Dict[str, pd.DataFrame]) -> Tuple:
+    # Only the columns stop patterns are built from, stop_times is the largest table
+    return (
+        int(pd.util.hash_pandas_object(
+            gtfs_data['trips'][['trip_id', 'route_id', 'direction_id']], index=False
+        ).sum()),
+        int(pd.util.hash_pandas_object(
+            gtfs_data['stop_times'][['trip_id', 'stop_id', 'stop_sequence']], index=False
+        ).sum())
+    )
+
+
+def _cached(cache: OrderedDict, key: Tuple, counter: str, build):
+    if key in cache:
+        increment(f"{counter}_cache_hits")
+        cache.move_to_end(key)
+        return cache[key]
+
+    increment(f"{counter}_cache_misses")
+    value = build()
+    cache[key] = value
+    if len(cache) > MAX_CACHED_FEEDS:
+        cache.popitem(last=False)
+    return value
+
+
+def get_segment_geometry(gtfs_data: Dict[str, pd.DataFrame],
+                         tolerance: float = DEFAULT_TOLERANCE) -> SegmentGeometry:
+    """Segment geometry for a feed, built once and reused while the feed is unchanged"""
+    return _cached(_geometry_cache, _feed_key(gtfs_data, tolerance), "segment_geometry",
+                   lambda: build_segment_geometry(gtfs_data, tolerance))
+
+
+def get_stop_patterns(gtfs_data: Dict[str, pd.DataFrame]) -> Dict[str, Dict]:
+    """GTFSParser.get_stop_patterns for a feed, reused while the feed is unchanged"""
+    return _cached(_pattern_cache, _pattern_key(gtfs_data), "stop_patterns",
+                   lambda: GTFSParser().get_stop_patterns(gtfs_data))
+
+
+def segments_from_comparison(geometry: SegmentGeometry,
+                             route_id: str,
+                             differences: Dict) -> List[AffectedSegment]:
+    """Map GTFSComparator differences for a route onto its segments.
+
+    Segments touching a skipped stop get the pattern type as status.
+    """
+    affected = {}
+    for direction_diffs in differences.values():
+        for diff in direction_diffs:
+            skipped = {str(stop_id) for stop_id in diff['skipped_stops']}
+            if not skipped:
+                continue
+            for segment in geometry.route_segments(route_id):
+                key = (segment.from_stop_id, segment.to_stop_id)
+                if key not in affected and (segment.from_stop_id in skipped or segment.to_stop_id in skipped):
+                    affected[key] = AffectedSegment(
+                        segment=segment,
+                        status=diff['pattern_type'],
+                        detail=f"{diff['trips_affected']} trips"
+                    )
+    return list(affected.values())
+
+
+def _segments_between(geometry: SegmentGeometry,
+                      route_id: str,
+                      from_ids: Set[str],
+                      to_ids: Set[str]) -> List[RouteSegment]:
+    for sequence in geometry.route_sequences.get(route_id, []):
+        from_idx = next((i for i, stop_id in enumerate(sequence) if stop_id in from_ids), None)
+        to_idx = next((i for i, stop_id in enumerate(sequence) if stop_id in to_ids), None)
+        if from_idx is None or to_idx is None or from_idx == to_idx:
+            continue
+        start, end = sorted((from_idx, to_idx))
+        return [
+            geometry.segments[(route_id, sequence[i], sequence[i + 1])]
+            for i in range(start, end)
+            if (route_id, sequence[i], sequence[i + 1]) in geometry.segments
+        ]
+    return []
+
+
+def segments_from_parse_result(geometry: SegmentGeometry,
+                               result: ParseResult) -> List[AffectedSegment]:
+    """Map a parser result onto segments by matching station names.
+
+    Changes with from/to stations cover every segment between them; skipped
+    stations mark the segments touching them.
+    """
+    affected = {}
+
+    for change in result.service_changes:
+        routes = [change.line] if change.line else result.affected_lines
+        from_ids = geometry.stop_ids_for_name(change.from_stop) if change.from_stop else set()
+        to_ids = geometry.stop_ids_for_name(change.to_stop) if change.to_stop else set()
+        if not from_ids or not to_ids:
+            continue
+        for route_id in routes:
+            for segment in _segments_between(geometry, route_id, from_ids, to_ids):
+                affected.setdefault(
+                    (segment.route_id, segment.from_stop_id, segment.to_stop_id),
+                    AffectedSegment(segment=segment, status=change.change_type, detail=change.detail)
+                )
+
+    skipped = set()
+    for name in result.stops_skipped:
+        skipped |= geometry.stop_ids_for_name(name)
+    if skipped:
+        for route_id in result.affected_lines:
+            for segment in geometry.route_segments(route_id):
+                if segment.from_stop_id in skipped or segment.to_stop_id in skipped:
+                    affected.setdefault(
+                        (segment.route_id, segment.from_stop_id, segment.to_stop_id),
+                        AffectedSegment(segment=segment, status='skip_stops')
+                    )
+
+    return list(affected.values())
+
+
+def _line_trace(segments: List[RouteSegment], name: str, color: str, width: int,
+                hover: Optional[List[str]] = None) -> go.Scattermap:
+    """One trace for many segments, separated by None so plotly draws a single path"""
+    lats, lons, text = [], [], []
+    for idx, segment in enumerate(segments):
+        lats.extend(segment.lats + (None,))
+        lons.extend(segment.lons + (None,))
+        if hover is not None:
+            text.extend([hover[idx]] * len(segment.lats) + [None])
+
+    return go.Scattermap(
+        lat=lats,
+        lon=lons,
+        mode='lines',
+        line={'color': color, 'width': width},
+        name=name,
+        text=text if hover is not None else None,
+        hoverinfo='text' if hover is not None else 'skip'
+    )
+
+
+def create_disruption_map(geometry: SegmentGeometry,
+                          affected: List[AffectedSegment],
+                          show_network: bool = True) -> go.Figure:
+    """Map of affected segments over the (simplified) network"""
+    with span("create_disruption_map", segments=len(affected)):
+        fig = go.Figure()
+
+        if show_network:
+            fig.add_trace(_line_trace(list(geometry.segments.values()), "Network", '#bbbbbb', 2))
+
+        by_status = {}
+        for item in affected:
+            by_status.setdefault(item.status, []).append(item)
+
+        for status, items in by_status.items():
+            hover = [
+                f"{item.segment.route_id}: {geometry.stop_names.get(item.segment.from_stop_id, item.segment.from_stop_id)}"
+                f" → {geometry.stop_names.get(item.segment.to_stop_id, item.segment.to_stop_id)}"
+                + (f"<br>{item.detail}" if item.detail else "")
+                for item in items
+            ]
+            fig.add_trace(_line_trace(
+                [item.segment for item in items],
+                status.replace('_', ' ').title(),
+                STATUS_COLORS.get(status, STATUS_COLORS['affected']),
+                5,
+                hover
+            ))
+
+        coords = np.array(list(geometry.stop_coords.values()) or [(40.7128, -74.0060)], dtype=float)
+        fig.update_layout(
+            map={
+                'style': 'open-street-map',
+                'center': {'lat': float(np.median(coords[:, 0])), 'lon': float(np.median(coords[:, 1]))},
+                'zoom': 10
+            },
+            margin={'l': 0, 'r': 0, 't': 0, 'b': 0},
+            height=650,
+            legend={'yanchor': 'top', 'y': 0.99, 'xanchor': 'left', 'x': 0.01}
+        )
+        return fig